@@ -0,0 +1,32 @@
+from argparse import ArgumentParser
+
+from benchmarks.core import BENCHMARKS, compare, load_results, report, run, save_results
+
+
+def main(args) -> None:
+    selected = [
+        (name, factory) for name, factory in BENCHMARKS
+        if any(pattern in name for pattern in args.filter or [""])]
+    results = run(selected, repeat=args.repeat, min_time=args.min_time)
+    print(report(results))
+    if args.compare is not None:
+        print()
+        print(compare(results, load_results(args.compare)))
+    if args.save is not None:
+        save_results(results, args.save)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        prog="python -m benchmarks", description="Benchmarks for Carta Mayor core classes")
+    parser.add_argument(
+        "-k", "--filter", action="append",
+        help="only run benchmarks whose name contains the given text, stackable")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=7, help="amount of timed rounds per benchmark")
+    parser.add_argument(
+        "-t", "--min-time", type=float, default=0.2,
+        help="minimum duration of each round, in seconds")
+    parser.add_argument("--save", help="save the results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="compare the results with a saved JSON baseline")
+    main(parser.parse_args())
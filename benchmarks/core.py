@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import statistics
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from itertools import cycle
+from typing import Callable, NamedTuple
+
+from cartamayor.common.classes import FULL_DECK, Pile
+from cartamayor.common.constants import MAX_VISIBLE_CARDS
+from cartamayor.common.types import GameMode, PileLocation
+from cartamayor.director import Director
+from cartamayor.engine import create_director, lowest_label_policy, play_match
+from cartamayor.interface import (
+    FrameRenderer, detailed_player_state, render_detailed_player_state, render_match_status,
+    render_table, show_match_status, show_table)
+from cartamayor.moves import get_legal_moves
+
+
+SEED = 1234
+NAMES = ("North", "East", "South", "West")
+
+Benchmark = Callable[[], Callable[[], object]]
+"""Factory that prepares the inputs of a benchmark and returns the callable to be timed."""
+
+
+class BenchResult(NamedTuple):
+    """Throughput of a benchmark over several rounds.
+
+    Parameters:
+        name (str): name of the benchmark.
+        rounds (list[float]): operations per second measured in each round.
+    """
+    name: str
+    rounds: list[float]
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.rounds)
+
+    @property
+    def stdev(self) -> float:
+        return statistics.stdev(self.rounds) if len(self.rounds) > 1 else 0.0
+
+
+def _shuffled_deck(seed: int = SEED) -> list:
+    deck = list(FULL_DECK)
+    random.Random(seed).shuffle(deck)
+    return deck
+
+
+def bench_add_cards_unsorted() -> Callable[[], object]:
+    deck = _shuffled_deck()
+    hand, new_cards = deck[:5], deck[5:25]
+    return lambda: Pile(PileLocation.PRIVATE, hand[:]).add_cards(new_cards)
+
+
+def bench_add_cards_sorted() -> Callable[[], object]:
+    deck = _shuffled_deck()
+    hand, new_cards = deck[:5], deck[5:25]
+    return lambda: Pile(PileLocation.PRIVATE, hand[:], sorted=True).add_cards(new_cards)
+
+
+def bench_remove_cards() -> Callable[[], object]:
+    deck = _shuffled_deck()
+    hand, to_remove = deck[:25], deck[10:13]
+    return lambda: Pile(PileLocation.PRIVATE, hand[:]).remove_cards(to_remove)
+
+
+def bench_get_playable_cards() -> Callable[[], object]:
+    deck = _shuffled_deck()
+    hand = Pile(PileLocation.PRIVATE, deck[:25])
+    table_pile = Pile(PileLocation.TABLE, deck[25:40])
+    return lambda: hand.get_playable_cards(table_pile)
+
+
+def bench_contains_playable_card() -> Callable[[], object]:
+    deck = _shuffled_deck()
+    hand = Pile(PileLocation.PRIVATE, deck[:25])
+    table_pile = Pile(PileLocation.TABLE, deck[25:40])
+    return lambda: hand.contains_playable_card(table_pile)
+
+
+def bench_build_deck() -> Callable[[], object]:
+    return Director.build_deck
+
+
+def bench_deal() -> Callable[[], object]:
+    match = create_director(GameMode.FULL_MONTY, NAMES, SEED).match
+    piles = match.get_piles()
+
+    def deal():
+        # Emptying the 14 piles is negligible next to shuffling and dealing 52 cards
+        for pile in piles:
+            pile.clear()
+        return match.deal()
+    return deal
+
+
+def bench_table_pile_display() -> Callable[[], object]:
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    deck = _shuffled_deck()
+    director.match.table_pile.extend(deck[:40])
+    latest_play = deck[39:40]
+    return lambda: director.get_table_pile_display(latest_play)
+
+
+def bench_show_table() -> Callable[[], object]:
+    deck = _shuffled_deck()
+    details = (40, [*deck[:2], *[None]*(MAX_VISIBLE_CARDS - 2)])
+    return lambda: show_table(details, 12)
+
+
+def bench_show_match_status() -> Callable[[], object]:
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    started_at = datetime(2023, 12, 31, 23, 59, 59)
+    return lambda: show_match_status(
+        director.match.initiative_queue, GameMode.FULL_MONTY, started_at)
+
+
+def bench_detailed_player_state() -> Callable[[], object]:
+    random.seed(SEED)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    director.match.deal()
+    player = director.match.initiative_queue[0]
+    return lambda: detailed_player_state(player)
+
+
+def bench_frame_render() -> Callable[[], object]:
+    random.seed(SEED)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    director.match.deal()
+    started_at = datetime(2023, 12, 31, 23, 59, 59)
+    details = (40, [*_shuffled_deck()[:2], *[None]*(MAX_VISIBLE_CARDS - 2)])
+    status = render_match_status(
+        director.match.initiative_queue, GameMode.FULL_MONTY, started_at)
+    frames = cycle([
+        [*status, *render_table(details, 12), *render_detailed_player_state(player)]
+        for player in director.match.initiative_queue])
+    # Writes to sys.stdout, which is the sink of time_benchmark while timing
+    renderer = FrameRenderer()
+    return lambda: renderer.render(next(frames))
+
+
+def _played_match():
+    random.seed(SEED)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    director.match.deal().start()
+    for _ in range(20):
+        director.play_turn(lowest_label_policy)
+    return director.match
+
+
+def bench_match_snapshot() -> Callable[[], object]:
+    return _played_match().snapshot
+
+
+def bench_match_restore() -> Callable[[], object]:
+    match = _played_match()
+    state = match.snapshot()
+    return lambda: match.restore(state)
+
+
+def bench_match_clone() -> Callable[[], object]:
+    return _played_match().clone
+
+
+def bench_match_zobrist_hash() -> Callable[[], object]:
+    match = _played_match()
+    return lambda: match.zobrist_hash
+
+
+def bench_get_legal_moves() -> Callable[[], object]:
+    match = _played_match()
+    player = match.initiative_queue[0]
+    return lambda: get_legal_moves(player, match)
+
+
+def bench_full_match() -> Callable[[], object]:
+    random.seed(SEED)
+    return lambda: play_match(
+        create_director(GameMode.FULL_MONTY, NAMES), lowest_label_policy)
+
+
+BENCHMARKS: list[tuple[str, Benchmark]] = [
+    ("pile.add_cards (unsorted, 20 cards)", bench_add_cards_unsorted),
+    ("pile.add_cards (sorted, 20 cards)", bench_add_cards_sorted),
+    ("pile.remove_cards (3 of 25 cards)", bench_remove_cards),
+    ("pile.get_playable_cards", bench_get_playable_cards),
+    ("pile.contains_playable_card", bench_contains_playable_card),
+    ("director.build_deck", bench_build_deck),
+    ("match.deal", bench_deal),
+    ("director.get_table_pile_display", bench_table_pile_display),
+    ("interface.show_table", bench_show_table),
+    ("interface.show_match_status", bench_show_match_status),
+    ("interface.detailed_player_state", bench_detailed_player_state),
+    ("interface.FrameRenderer.render", bench_frame_render),
+    ("match.snapshot", bench_match_snapshot),
+    ("match.restore", bench_match_restore),
+    ("match.clone", bench_match_clone),
+    ("match.zobrist_hash", bench_match_zobrist_hash),
+    ("moves.get_legal_moves", bench_get_legal_moves),
+    ("engine.play_match (full match)", bench_full_match),
+]
+
+
+def _calibrate(func: Callable[[], object], min_time: float) -> int:
+    """Find the amount of calls that takes at least 'min_time' seconds."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return number
+        number *= 2
+
+
+def time_benchmark(
+        name: str, factory: Benchmark, repeat: int, min_time: float) -> BenchResult:
+    """
+    Time a benchmark over several rounds. Output printed by the benchmark is discarded.
+
+    Args:
+        name (str): Name of the benchmark.
+        factory (Benchmark): Factory of the callable to be timed.
+        repeat (int): Amount of timed rounds.
+        min_time (float): Minimum duration of each round, in seconds.
+
+    Returns:
+        BenchResult: Operations per second of each round.
+    """
+    with open(os.devnull, "w") as sink, redirect_stdout(sink):
+        func = factory()
+        number = _calibrate(func, min_time)
+        rounds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            rounds.append(number/(time.perf_counter() - start))
+    return BenchResult(name, rounds)
+
+
+def run(
+        benchmarks: list[tuple[str, Benchmark]], repeat: int = 7,
+        min_time: float = 0.2) -> list[BenchResult]:
+    return [time_benchmark(name, factory, repeat, min_time) for name, factory in benchmarks]
+
+
+def report(results: list[BenchResult]) -> str:
+    """Build a table with the throughput of each benchmark (mean ± standard deviation, and
+    the range of the rounds)."""
+    lines = [f"{'benchmark':<40} {'ops/s':>14} {'± stdev':>12} {'min':>14} {'max':>14}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<40} {result.mean:>14,.0f} {result.stdev:>12,.0f} "
+            f"{min(result.rounds):>14,.0f} {max(result.rounds):>14,.0f}")
+    return "\n".join(lines)
+
+
+def save_results(results: list[BenchResult], path: str) -> None:
+    with open(path, "w") as file_:
+        json.dump({result.name: result.rounds for result in results}, file_, indent=4)
+
+
+def load_results(path: str) -> list[BenchResult]:
+    with open(path, "r") as file_:
+        return [BenchResult(name, rounds) for name, rounds in json.load(file_).items()]
+
+
+def compare(results: list[BenchResult], baseline: list[BenchResult]) -> str:
+    """Build a table with the relative change of throughput against a baseline."""
+    baseline_by_name = {result.name: result for result in baseline}
+    lines = [f"{'benchmark':<40} {'baseline ops/s':>14} {'ops/s':>14} {'change':>9}"]
+    for result in results:
+        reference = baseline_by_name.get(result.name)
+        if reference is None:
+            continue
+        change = (result.mean/reference.mean - 1)*100
+        lines.append(
+            f"{result.name:<40} {reference.mean:>14,.0f} {result.mean:>14,.0f} "
+            f"{change:>+8.1f}%")
+    return "\n".join(lines)
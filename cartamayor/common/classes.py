@@ -1,33 +1,73 @@
 from __future__ import annotations
 
+import math
 from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Iterable
+from itertools import islice
+from typing import Iterable, Iterator
 
-from cartamayor.common.constants import LABEL_TO_STATS
+from cartamayor.common.constants import (
+    CARD_LABELS, DECK_SIZE, LABEL_TO_INDEX, LABEL_TO_STATS, NO_HASH_KEYS, PLAYABILITY_TABLE,
+    PLAYABLE_CARDS_MASK, RANK_TO_POWER, RANK_TO_POWER_BIT, RANKS_BY_POWER,
+    RANKS_UP_TO_POWER, SUIT_TO_INDEX)
 from cartamayor.common.types import PileLocation, Suit
 
 
-@dataclass(unsafe_hash=True, slots=True)
+@dataclass(slots=True)
 class Card:
     """A playing Card, which is identified by label and suit. Objects from this class are
     logically immutable, even though the class is not a frozen dataclasse.
 
+    The 52 cards of the deck are built once, in FULL_DECK, and 'get_card' should be used to
+    obtain them, so the same instances are shared by every match. Equality and hashing only
+    rely on the card id.
+
     Parameters:
         label (str): label of the card, representing its rank.
         suit (Suit): suit of the card, from french standard deck.
         power (float): value to determine on top of which cards this card can be played.
         resistance (float): value to determine which cards cannot be played on top of this
             card.
+        rank (int): index of the label in CARD_LABELS (0-12).
+        id (int): position of the card in a full deck (0-51), derived from label and suit.
+        bit (int): single bit set at position 'id', used for card sets encoded as integers.
     """
     label: str
     suit: Suit
     power: float = field(default=0, compare=False)
     resistance: float = field(default=0, compare=False)
+    rank: int = field(default=0, init=False, compare=False)
+    id: int = field(default=0, init=False, compare=False)
+    bit: int = field(default=0, init=False, compare=False)
 
     def __post_init__(self) -> None:
-        """Assign power and resistance to the card based on its label."""
+        """Assign power, resistance and deck position to the card based on its label and
+        suit."""
         self.power, self.resistance = LABEL_TO_STATS[self.label]
+        self.rank = LABEL_TO_INDEX[self.label]
+        self.id = SUIT_TO_INDEX[self.suit]*len(CARD_LABELS) + self.rank
+        self.bit = 1 << self.id
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not Card:
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def __copy__(self) -> Card:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Card:
+        return self
+
+    def __reduce__(self) -> tuple:
+        """Unpickle as the shared instance of the registry, see 'get_card'."""
+        return (get_card, (self.label, self.suit))
 
     def __str__(self) -> str:
         return f"{self.suit.value}{self.label}"
@@ -37,7 +77,8 @@ class Card:
 
     def is_playable_on(self, other: Card) -> bool:
         """A card is considered playable (on top of another) if its power is greater than
-        or equal to the other's resistance.
+        or equal to the other's resistance. The answer is precomputed for every pair of
+        labels in PLAYABILITY_TABLE.
 
         Args:
             other (Card): Reference card on top of which the current would be played.
@@ -46,14 +87,49 @@ class Card:
             bool: True if the card has a power greater or equal to the other's resistance,
             False otherwise.
         """
-        if self.power >= other.resistance:
-            return True
-        return False
+        return PLAYABILITY_TABLE[self.rank][other.rank]
+
+
+FULL_DECK: tuple[Card, ...] = tuple(
+    Card(label, suit) for suit in Suit for label in CARD_LABELS)
+
+
+def get_card(label: str, suit: Suit) -> Card:
+    """Get the shared instance of a card from the registry of the full deck.
+
+    Args:
+        label (str): label of the card, representing its rank.
+        suit (Suit): suit of the card.
+
+    Returns:
+        Card: Card from FULL_DECK with the given label and suit.
+    """
+    return FULL_DECK[SUIT_TO_INDEX[suit]*len(CARD_LABELS) + LABEL_TO_INDEX[label]]
+
+
+REMOVAL_REBUILD_THRESHOLD = 4
+"""Above this amount of cards, removals rebuild the pile in a single pass instead of
+removing each card separately."""
 
 
 class Pile(deque):
     """
     A pile of cards, in a specific location of the game.
+
+    Besides the ordered content (deque), the pile keeps a card set encoded as an integer
+    (one bit per card, see Card.bit), which is updated on every change to the content. This
+    allows membership, union, difference and playability checks to be single integer
+    operations. A histogram of the card ranks and the set of ranks present (ordered by
+    power) are kept as well, which give the position of new cards in sorted piles and the
+    strongest card of the pile in constant time.
+
+    Runs of cards with the same label are tracked from the bottom to the top of the pile,
+    incrementally when cards are appended to or popped from the top (e.g. the table pile).
+    Any other change only marks them to be rebuilt the next time they are needed.
+
+    Once the pile is given Zobrist keys (see 'set_hash_keys'), the XOR of the keys of its
+    cards is kept as well, in constant time per card. Being an XOR, it only reflects which
+    cards are in the pile (not their order), and duplicated cards cancel each other out.
     """
     def __init__(
             self,
@@ -73,9 +149,11 @@ class Pile(deque):
             cards = []
         self.location = location
         self.sorted = sorted
+        self._hash_keys = NO_HASH_KEYS
         if self.sorted:
             cards.sort(key=lambda card: card.power)
         super().__init__(cards)
+        self._recount()
 
     def __eq__(self, other: Pile) -> bool:
         """Define equality of Pile based on content and location.
@@ -88,6 +166,8 @@ class Pile(deque):
             equality), False otherwise.
         """
         if self.location == other.location:
+            if isinstance(other, Pile) and self._mask != other._mask:
+                return False
             return super().__eq__(other)
         return False
 
@@ -110,6 +190,279 @@ class Pile(deque):
     def __str__(self) -> str:
         return self._build_display_str(str(item) for item in self)
 
+    def __contains__(self, card: Card) -> bool:
+        try:
+            return bool(self._mask & card.bit)
+        except AttributeError:
+            return super().__contains__(card)
+
+    @property
+    def mask(self) -> int:
+        """Card set of the pile, with bit 'Card.id' set for every card in it."""
+        return self._mask
+
+    @property
+    def rank_counts(self) -> list[int]:
+        """Amount of cards in the pile for each label index (see Card.rank). Read-only."""
+        return self._rank_counts
+
+    @property
+    def top_run_length(self) -> int:
+        """Amount of cards on top of the pile with the same label as the top card."""
+        runs = self._get_runs()
+        return runs[-1][1] if runs else 0
+
+    def get_run(self, depth: int = 0) -> tuple[str | None, int]:
+        """Get a run of cards with the same label, counting runs from the top of the pile.
+
+        Args:
+            depth (int): Amount of runs above the desired one. Defaults to 0 (top run).
+
+        Returns:
+            tuple[str | None, int]: Label and amount of cards of the run, or (None, 0) if
+            the pile doesn't have that many runs.
+        """
+        runs = self._get_runs()
+        if depth >= len(runs):
+            return (None, 0)
+        rank, length = runs[-1 - depth]
+        return (CARD_LABELS[rank], length)
+
+    @property
+    def zobrist_hash(self) -> int:
+        """XOR of the Zobrist keys of the cards in the pile, 0 if the pile has no keys."""
+        return self._hash
+
+    def set_hash_keys(self, keys: tuple[int, ...]) -> Pile:
+        """
+        Set the Zobrist keys of the pile (one per card id) and hash its current content.
+
+        Args:
+            keys (tuple[int, ...]): Key of each card id, see ZOBRIST_SEAT_PILE_KEYS and
+            ZOBRIST_SHARED_PILE_KEYS.
+
+        Returns:
+            Pile: self.
+        """
+        self._hash_keys = keys
+        zobrist_hash = 0
+        for card in self:
+            zobrist_hash ^= keys[card.id]
+        self._hash = zobrist_hash
+        return self
+
+    @property
+    def max_power(self) -> float:
+        """Highest power among the cards in the pile, -inf if the pile is empty."""
+        if not self._power_mask:
+            return -math.inf
+        return RANK_TO_POWER[RANKS_BY_POWER[self._power_mask.bit_length() - 1]]
+
+    @property
+    def weakest_rank(self) -> int:
+        """Label index of the weakest card in the pile (see RANKS_BY_POWER), -1 if the pile
+        is empty."""
+        power_mask = self._power_mask
+        if not power_mask:
+            return -1
+        return RANKS_BY_POWER[(power_mask & -power_mask).bit_length() - 1]
+
+    def _reset_counters(self) -> None:
+        """Set the card set and every counter to the values of an empty pile."""
+        self._counts = bytearray(DECK_SIZE)
+        self._rank_counts = [0]*len(CARD_LABELS)
+        self._power_mask = 0
+        self._mask = 0
+        self._hash = 0
+        self._runs: list[list[int]] | None = []
+
+    def _recount(self) -> None:
+        """Rebuild the card set and card counters from the current content of the pile."""
+        self._reset_counters()
+        self._track(self)
+        self._runs = None
+
+    def _get_runs(self) -> list[list[int]]:
+        """Get the runs of the pile as [rank, length] pairs, from bottom to top, rebuilding
+        them if they were invalidated."""
+        if self._runs is None:
+            self._runs = []
+            self._push_runs(self)
+        return self._runs
+
+    def _push_runs(self, cards: Iterable[Card]) -> None:
+        """Register cards that were added to the top of the pile in the runs."""
+        runs = self._runs
+        for card in cards:
+            if runs and runs[-1][0] == card.rank:
+                runs[-1][1] += 1
+            else:
+                runs.append([card.rank, 1])
+
+    def _track(self, cards: Iterable[Card]) -> None:
+        """Register cards that were added to the underlying deque."""
+        counts = self._counts
+        rank_counts = self._rank_counts
+        hash_keys = self._hash_keys
+        mask = self._mask
+        power_mask = self._power_mask
+        zobrist_hash = self._hash
+        for card in cards:
+            counts[card.id] += 1
+            mask |= card.bit
+            zobrist_hash ^= hash_keys[card.id]
+            if not rank_counts[card.rank]:
+                power_mask |= RANK_TO_POWER_BIT[card.rank]
+            rank_counts[card.rank] += 1
+        self._mask = mask
+        self._power_mask = power_mask
+        self._hash = zobrist_hash
+
+    def _track_card(self, card: Card) -> None:
+        """Register a card that was added to the underlying deque."""
+        self._counts[card.id] += 1
+        self._mask |= card.bit
+        self._hash ^= self._hash_keys[card.id]
+        if not self._rank_counts[card.rank]:
+            self._power_mask |= RANK_TO_POWER_BIT[card.rank]
+        self._rank_counts[card.rank] += 1
+
+    def _untrack(self, card: Card) -> None:
+        """Unregister a card that was removed from the underlying deque."""
+        count = self._counts[card.id] - 1
+        self._counts[card.id] = count
+        self._hash ^= self._hash_keys[card.id]
+        if not count:
+            self._mask &= ~card.bit
+        count = self._rank_counts[card.rank] - 1
+        self._rank_counts[card.rank] = count
+        if not count:
+            self._power_mask &= ~RANK_TO_POWER_BIT[card.rank]
+
+    def append(self, card: Card) -> None:
+        super().append(card)
+        self._track_card(card)
+        runs = self._runs
+        if runs is not None:
+            if runs and runs[-1][0] == card.rank:
+                runs[-1][1] += 1
+            else:
+                runs.append([card.rank, 1])
+
+    def appendleft(self, card: Card) -> None:
+        super().appendleft(card)
+        self._track_card(card)
+        self._runs = None
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        cards = list(cards)
+        super().extend(cards)
+        self._track(cards)
+        if self._runs is not None:
+            self._push_runs(cards)
+
+    def extendleft(self, cards: Iterable[Card]) -> None:
+        cards = list(cards)
+        super().extendleft(cards)
+        self._track(cards)
+        self._runs = None
+
+    def insert(self, index: int, card: Card) -> None:
+        super().insert(index, card)
+        self._track_card(card)
+        self._runs = None
+
+    def pop(self) -> Card:
+        card = super().pop()
+        self._untrack(card)
+        runs = self._runs
+        if runs is not None:
+            runs[-1][1] -= 1
+            if not runs[-1][1]:
+                runs.pop()
+        return card
+
+    def popleft(self) -> Card:
+        card = super().popleft()
+        self._untrack(card)
+        self._runs = None
+        return card
+
+    def remove(self, card: Card) -> None:
+        super().remove(card)
+        self._untrack(card)
+        self._runs = None
+
+    def rotate(self, steps: int = 1) -> None:
+        super().rotate(steps)
+        self._runs = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._runs = None
+
+    def clear(self) -> None:
+        super().clear()
+        self._reset_counters()
+
+    def __iadd__(self, cards: Iterable[Card]) -> Pile:
+        self.extend(cards)
+        return self
+
+    def __imul__(self, times: int) -> Pile:
+        super().__imul__(times)
+        self._recount()
+        return self
+
+    def __setitem__(self, index: int, card: Card) -> None:
+        super().__setitem__(index, card)
+        self._recount()
+
+    def __delitem__(self, index: int) -> None:
+        super().__delitem__(index)
+        self._recount()
+
+    def __copy__(self) -> Pile:
+        """Copy the pile and its counters, without tracking the cards again (shallow, the
+        cards are shared)."""
+        pile = self.__class__.__new__(self.__class__)
+        deque.__init__(pile, self)
+        pile.location = self.location
+        pile.sorted = self.sorted
+        pile._counts = self._counts[:]
+        pile._rank_counts = self._rank_counts[:]
+        pile._power_mask = self._power_mask
+        pile._mask = self._mask
+        pile._hash_keys = self._hash_keys
+        pile._hash = self._hash
+        pile._runs = None if self._runs is None else [run[:] for run in self._runs]
+        return pile
+
+    def __reduce__(self) -> tuple:
+        return (
+            self.__class__, (self.location, list(self)),
+            {"sorted": self.sorted, "hash_keys": self._hash_keys})
+
+    def __setstate__(self, state: dict) -> None:
+        self.sorted = state["sorted"]
+        self.set_hash_keys(state.get("hash_keys", NO_HASH_KEYS))
+
+    def reset(self, cards: Iterable[Card]) -> Pile:
+        """
+        Replace the whole content of the pile, keeping its order as given (even for sorted
+        piles).
+
+        Args:
+            cards (Iterable[Card]): New content of the pile, from bottom to top.
+
+        Returns:
+            Pile: self.
+        """
+        super().clear()
+        super().extend(cards)
+        self._recount()
+        return self
+
     def _build_display_str(self, pack: Iterable[str]) -> str:
         """
         Abstract the construction of a display string to get any iterable string input.
@@ -124,6 +477,18 @@ class Pile(deque):
         location = f"({self.location.name})"
         return f"{location:<9} Pile[{content}]"
 
+    def top(self, count: int) -> Iterator[Card]:
+        """Iterate over the top cards of the pile, from the top down, without copying it.
+
+        Args:
+            count (int): Maximum amount of cards to iterate over.
+
+        Returns:
+            Iterator[Card]: Lazy view over the last 'count' cards of the pile, in reverse
+            order. The pile must not be changed while the view is consumed.
+        """
+        return islice(reversed(self), count)
+
     def get_display_length(self) -> str:
         if len(self) > 5:
             return "5+"
@@ -133,6 +498,10 @@ class Pile(deque):
         """
         Add cards to the pile, keeping sorting order if relevant.
 
+        On sorted piles, each card is inserted after every card with power lower than or
+        equal to its own, the same order of a stable sort by power. The position comes from
+        the rank histogram, so it costs the same regardless of the size of the pile.
+
         Args:
             cards (list[Card]): New cards to add to the pile.
 
@@ -142,11 +511,10 @@ class Pile(deque):
         if not self.sorted:
             self.extend(cards)
         else:
-            index_to_insert = 0
-            for new_card in sorted(cards, key=lambda c: c.power):
-                for card in self:
-                    if new_card.power > card.power:
-                        index_to_insert += 1
+            rank_counts = self._rank_counts
+            for new_card in cards:
+                index_to_insert = sum(
+                    rank_counts[rank] for rank in RANKS_UP_TO_POWER[new_card.rank])
                 self.insert(index_to_insert, new_card)
         return self
 
@@ -159,6 +527,20 @@ class Pile(deque):
         """
         return self._build_display_str("▇" for _ in self)
 
+    def get_playable_mask(self, table_pile: Pile) -> int:
+        """Return the card set (bitmask) of the playable cards contained in the pile.
+
+        Args:
+            table_pile (Pile): Pile of cards currently in the table.
+
+        Returns:
+            int: Card set with the bits of the cards that have a power greater than or equal
+            to the table pile's last/top card resistance.
+        """
+        if not table_pile:
+            return self._mask
+        return self._mask & PLAYABLE_CARDS_MASK[table_pile[-1].rank]
+
     def contains_playable_card(self, table_pile: Pile) -> bool:
         """Define whether or not a pile contains at least one playable card given the table
         pile.
@@ -168,13 +550,12 @@ class Pile(deque):
 
         Returns:
             bool: True if the pile has a card with power greater than or equal to the
-            resitance of the table pile's last/top card or if the table pile is empty.
+            resitance of the table pile's last/top card or if the table pile is empty. An
+            empty pile has no playable card on a non-empty table pile.
         """
         if not table_pile:
             return True
-        if max((card.power for card in self)) >= table_pile[-1].resistance:
-            return True
-        return False
+        return bool(self._mask & PLAYABLE_CARDS_MASK[table_pile[-1].rank])
 
     def get_playable_cards(self, table_pile: Pile) -> set:
         """Return a set of the playable cards contained in the pile.
@@ -188,11 +569,13 @@ class Pile(deque):
         """
         if not table_pile:
             return set(self)
-        return set(card for card in self if card.power >= table_pile[-1].resistance)
+        return set(mask_to_cards(self.get_playable_mask(table_pile)))
 
     def remove_cards(self, cards: Iterable[Card]) -> Pile:
         """Remove a collection of cards from the pile.
 
+        The removal is atomic: the pile is left untouched if any card can't be removed.
+
         Args:
             cards (Iterable[Card]): Collection of cards to be removed from the pile. If any
             card is not present in the Pile, ValueError is raised.
@@ -200,11 +583,63 @@ class Pile(deque):
         Returns:
             Pile: Pile after removal of all cards from the collection.
         """
+        cards = list(cards)
+        pending = bytearray(DECK_SIZE)
         for card in cards:
-            self.remove(card)
+            pending[card.id] += 1
+            if pending[card.id] > self._counts[card.id]:
+                raise ValueError(f"{card!r} is not in the pile")
+        self._runs = None
+        if len(cards) <= REMOVAL_REBUILD_THRESHOLD:
+            for card in cards:
+                super().remove(card)
+                self._untrack(card)
+            return self
+        kept = []
+        for card in self:
+            if pending[card.id]:
+                pending[card.id] -= 1
+                self._untrack(card)
+            else:
+                kept.append(card)
+        super().clear()
+        super().extend(kept)
         return self
 
 
+def cards_to_mask(cards: Iterable[Card]) -> int:
+    """Encode a collection of cards as a card set, i.e. an integer with bit 'Card.id' set
+    for each card.
+
+    Args:
+        cards (Iterable[Card]): Cards to be encoded.
+
+    Returns:
+        int: Card set of the given cards.
+    """
+    mask = 0
+    for card in cards:
+        mask |= card.bit
+    return mask
+
+
+def mask_to_cards(mask: int) -> list[Card]:
+    """Decode a card set into the shared Card instances it contains.
+
+    Args:
+        mask (int): Card set, with bit 'Card.id' set for each card in it.
+
+    Returns:
+        list[Card]: Cards from FULL_DECK in the set, in deck order.
+    """
+    cards = []
+    while mask:
+        lowest_bit = mask & -mask
+        cards.append(FULL_DECK[lowest_bit.bit_length() - 1])
+        mask ^= lowest_bit
+    return cards
+
+
 @dataclass(frozen=True, slots=True)
 class Player:
     """
@@ -264,3 +699,93 @@ class Team:
         return (
             f"{type(self).__name__} {self.name}: {self.players[0].name} | "
             f"{self.players[1].name}")
+
+
+class Initiative(Sequence):
+    """
+    Order of play of a match: a fixed array of seats, the seat who has the initiative (the
+    head) and the direction of play. As a sequence, item k is the k-th player to play from
+    the head, so advancing, reversing and looking ahead are O(1) and allocate nothing.
+
+    Attributes:
+        seats (tuple[Player, ...]): players in seat order, which never changes.
+        head (int): seat index of the player who has the initiative.
+        direction (int): 1 if play goes up the seat indexes, -1 if it goes down.
+    """
+    __slots__ = ("seats", "head", "direction")
+
+    def __init__(self, players: Iterable[Player]) -> None:
+        """
+        Args:
+            players (Iterable[Player]): Players in seat order, the first one has the
+            initiative and play goes up the seat indexes.
+        """
+        self.seats = tuple(players)
+        self.head = 0
+        self.direction = 1
+
+    def __len__(self) -> int:
+        return len(self.seats)
+
+    def __getitem__(self, index: int) -> Player:
+        seats = len(self.seats)
+        if not -seats <= index < seats:
+            raise IndexError("Initiative index out of range")
+        return self.seats[(self.head + self.direction*index) % seats]
+
+    def __iter__(self) -> Iterator[Player]:
+        seats, head, direction = self.seats, self.head, self.direction
+        amount = len(seats)
+        for index in range(amount):
+            yield seats[(head + direction*index) % amount]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Initiative):
+            return NotImplemented
+        return (
+            self.seats == other.seats and self.head == other.head
+            and self.direction == other.direction)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}([{', '.join(player.name for player in self)}])"
+
+    @property
+    def current(self) -> Player:
+        """Player who has the initiative, same as item 0."""
+        return self.seats[self.head]
+
+    def get_next(self, steps: int = 1) -> Player:
+        """Get the player who will have the initiative after some turns, with no kills nor
+        changes of direction (any amount of steps, wrapping around the seats)."""
+        return self.seats[(self.head + self.direction*steps) % len(self.seats)]
+
+    def get_seat(self, index: int = 0) -> int:
+        """Get the seat index of the k-th player to play from the head."""
+        return (self.head + self.direction*index) % len(self.seats)
+
+    def advance(self, steps: int = 1) -> Initiative:
+        """Give the initiative to the player 'steps' turns ahead in the direction of
+        play."""
+        self.head = (self.head + self.direction*steps) % len(self.seats)
+        return self
+
+    def reverse(self) -> Initiative:
+        """Flip the direction of play, the head keeps the initiative."""
+        self.direction = -self.direction
+        return self
+
+    def set_order(self, order: Sequence[int]) -> Initiative:
+        """
+        Set the head and direction from an order of play given as seat indexes, which must
+        be a rotation of the seats in either direction.
+
+        Args:
+            order (Sequence[int]): Seat index of each player, in order of play.
+
+        Returns:
+            Initiative: self.
+        """
+        self.head = order[0]
+        seats = len(self.seats)
+        self.direction = 1 if seats < 3 or order[1] == (order[0] + 1) % seats else -1
+        return self
@@ -1,11 +1,19 @@
 import math
-from cartamayor.common.types import CardStats, GameMode, PileLocation
+import random
+from cartamayor.common.types import CardStats, GameMode, PileLocation, Suit
 
 
 PILE_COUNTER_LIMIT = 5
 MAX_VISIBLE_CARDS = 6
+KILL_RUN_LENGTH = 4
 
 CARD_LABELS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+DECK_SIZE = len(Suit)*len(CARD_LABELS)
+
+# Card ids follow the deck building order (suit-major), so each card owns bit 'id' of a
+# 52-bit card set
+LABEL_TO_INDEX = {label: index for index, label in enumerate(CARD_LABELS)}
+SUIT_TO_INDEX = {suit: index for index, suit in enumerate(Suit)}
 
 INITIAL_PILE_SIZES = {
     GameMode.FATAL_THREE_WAY: {
@@ -17,6 +25,7 @@ INITIAL_PILE_SIZES = {
         PileLocation.PRIVATE: 5,
         PileLocation.OPEN: 4,
         PileLocation.HIDDEN: 4}}
+SEAT_COUNTS = {GameMode.FATAL_THREE_WAY: 3, GameMode.FULL_MONTY: 4}
 
 
 LABEL_TO_STATS = {
@@ -34,3 +43,74 @@ LABEL_TO_STATS = {
     "K": CardStats(power=13, resistance=13),
     "A": CardStats(power=14, resistance=14)
 }
+
+RANK_TO_POWER = tuple(LABEL_TO_STATS[label].power for label in CARD_LABELS)
+
+# Label indexes sorted by power (ties keep the label order), and the bit assigned to each
+# label index in sets of labels that follow this order (highest bit = strongest label)
+RANKS_BY_POWER = tuple(
+    sorted(range(len(CARD_LABELS)), key=lambda rank: RANK_TO_POWER[rank]))
+RANK_TO_POWER_POSITION = tuple(
+    RANKS_BY_POWER.index(rank) for rank in range(len(CARD_LABELS)))
+RANK_TO_POWER_BIT = tuple(1 << position for position in RANK_TO_POWER_POSITION)
+
+# Bam-bam score of a hand: power position of its weakest label times the weight, minus the
+# amount of cards of that label (at most 4, so the weight keeps positions apart)
+BAMBAM_POSITION_WEIGHT = 8
+BAMBAM_NO_CARDS_SCORE = len(CARD_LABELS)*BAMBAM_POSITION_WEIGHT
+
+# For each label index, the label indexes with power lower than or equal to its own, which
+# are the ones placed before it in a pile sorted by power
+RANKS_UP_TO_POWER = tuple(
+    tuple(
+        index for index, other in enumerate(CARD_LABELS)
+        if LABEL_TO_STATS[other].power <= LABEL_TO_STATS[label].power)
+    for label in CARD_LABELS)
+
+# Playability of a card (first index) on top of another (second index), both given by the
+# label index, i.e. whether the power of the first is greater than or equal to the
+# resistance of the second
+PLAYABILITY_TABLE = tuple(
+    tuple(
+        LABEL_TO_STATS[label].power >= LABEL_TO_STATS[top_label].resistance
+        for top_label in CARD_LABELS)
+    for label in CARD_LABELS)
+
+# Label indexes (as bits of a 13-bit mask) playable on top of each label index
+PLAYABLE_RANKS_MASK = tuple(
+    sum(1 << rank for rank in range(len(CARD_LABELS)) if PLAYABILITY_TABLE[rank][top_rank])
+    for top_rank in range(len(CARD_LABELS)))
+
+# Card set (bitmask, see Card.bit) of every card playable on top of each label index
+PLAYABLE_CARDS_MASK = tuple(
+    sum(
+        rank_mask << (suit_index*len(CARD_LABELS))
+        for suit_index in SUIT_TO_INDEX.values())
+    for rank_mask in PLAYABLE_RANKS_MASK)
+
+# Zobrist hashing: a random 64-bit key for each card in each pile of the game (piles owned
+# by a player depend on the seat), for the player at the head of the initiative queue, for
+# a reversed direction of play and for the top run of the table pile (label index and
+# length up to KILL_RUN_LENGTH). Keys are generated from a fixed seed, so hashes are stable
+# across runs and processes
+MAX_SEATS = 4
+ZOBRIST_SEED = 0x5A0B15
+_zobrist_rng = random.Random(ZOBRIST_SEED)
+
+
+def _zobrist_keys(amount: int) -> tuple[int, ...]:
+    return tuple(_zobrist_rng.getrandbits(64) for _ in range(amount))
+
+
+ZOBRIST_SEAT_PILE_KEYS = tuple(
+    {
+        location: _zobrist_keys(DECK_SIZE)
+        for location in (PileLocation.PRIVATE, PileLocation.OPEN, PileLocation.HIDDEN)}
+    for _ in range(MAX_SEATS))
+ZOBRIST_SHARED_PILE_KEYS = {
+    location: _zobrist_keys(DECK_SIZE)
+    for location in (PileLocation.TABLE, PileLocation.DEAD)}
+ZOBRIST_HEAD_KEYS = _zobrist_keys(MAX_SEATS)
+ZOBRIST_REVERSED_KEY = _zobrist_keys(1)[0]
+ZOBRIST_TABLE_TOP_KEYS = tuple(_zobrist_keys(KILL_RUN_LENGTH) for _ in CARD_LABELS)
+NO_HASH_KEYS = (0,)*DECK_SIZE
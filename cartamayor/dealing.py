@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Iterator, NamedTuple, Sequence
+
+from cartamayor.common.classes import FULL_DECK
+from cartamayor.common.constants import (
+    BAMBAM_POSITION_WEIGHT, CARD_LABELS, DECK_SIZE, INITIAL_PILE_SIZES,
+    RANK_TO_POWER_POSITION, SEAT_COUNTS)
+from cartamayor.common.types import GameMode, PileLocation
+from cartamayor.director import Director
+from cartamayor.engine import create_director
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only batch dealing needs it
+    np = None
+
+
+SEAT_LOCATIONS = (PileLocation.PRIVATE, PileLocation.OPEN, PileLocation.HIDDEN)
+# Power position (see RANK_TO_POWER_POSITION) of each card id
+CARD_POWER_POSITIONS = tuple(
+    RANK_TO_POWER_POSITION[card_id % len(CARD_LABELS)] for card_id in range(DECK_SIZE))
+
+
+class BatchDeal(NamedTuple):
+    """Cards (ids) dealt in a batch of matches, as views of the dealt permutations, in the
+    order of Match.deal.
+
+    Parameters:
+        game_mode (GameMode): game mode of every match.
+        decks (np.ndarray): deck order of each match, shape (matches, DECK_SIZE).
+        private (np.ndarray): private cards, shape (matches, seats, private size).
+        open (np.ndarray): open cards, shape (matches, seats, open size).
+        hidden (np.ndarray): hidden cards, shape (matches, seats, hidden size).
+        dead (np.ndarray): cards dealt to the dead pile, shape (matches, dead size).
+    """
+    game_mode: GameMode
+    decks: np.ndarray
+    private: np.ndarray
+    open: np.ndarray
+    hidden: np.ndarray
+    dead: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.decks)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ModuleNotFoundError("Batch dealing requires NumPy (pip install numpy)")
+
+
+def shuffle_decks(matches: int, seed: int | None = None) -> np.ndarray:
+    """
+    Shuffle the decks of many matches in one call, each row being an independent
+    permutation of the card ids.
+
+    Args:
+        matches (int): Amount of decks.
+        seed (int | None): Seed of the NumPy random generator. Defaults to None (fresh
+        entropy).
+
+    Raises:
+        ModuleNotFoundError: If NumPy is not installed.
+
+    Returns:
+        np.ndarray: Card ids as uint8, shape (matches, DECK_SIZE).
+    """
+    _require_numpy()
+    decks = np.broadcast_to(np.arange(DECK_SIZE, dtype=np.uint8), (matches, DECK_SIZE))
+    return np.random.default_rng(seed).permuted(decks, axis=1)
+
+
+def split_decks(decks: np.ndarray, game_mode: GameMode) -> BatchDeal:
+    """
+    Map each deck to the piles it is dealt to, following the INITIAL_PILE_SIZES layout of
+    the game mode: every seat gets a contiguous block with its private, open and hidden
+    cards, then the rest goes to the dead pile. No card is copied.
+
+    Args:
+        decks (np.ndarray): Card ids, shape (matches, DECK_SIZE).
+        game_mode (GameMode): Game mode of the matches.
+
+    Returns:
+        BatchDeal: Dealt piles of every match.
+    """
+    sizes = INITIAL_PILE_SIZES[game_mode]
+    seats = SEAT_COUNTS[game_mode]
+    seat_size = sum(sizes[location] for location in SEAT_LOCATIONS)
+    dealt = seats*seat_size
+    by_seat = decks[:, :dealt].reshape(len(decks), seats, seat_size)
+    bounds = np.cumsum([0, *(sizes[location] for location in SEAT_LOCATIONS)])
+    private, open_, hidden = (
+        by_seat[:, :, start:end] for start, end in zip(bounds[:-1], bounds[1:]))
+    dead = decks[:, dealt:dealt + sizes.get(PileLocation.DEAD, 0)]
+    return BatchDeal(game_mode, decks, private, open_, hidden, dead)
+
+
+def deal_batch(
+        matches: int, game_mode: GameMode = GameMode.FULL_MONTY,
+        seed: int | None = None) -> BatchDeal:
+    """
+    Deal many matches at once, see 'shuffle_decks' and 'split_decks'.
+
+    Args:
+        matches (int): Amount of matches.
+        game_mode (GameMode): Game mode of the matches. Defaults to FULL_MONTY.
+        seed (int | None): Seed of the NumPy random generator. Defaults to None.
+
+    Returns:
+        BatchDeal: Dealt piles of every match.
+    """
+    return split_decks(shuffle_decks(matches, seed), game_mode)
+
+
+def get_bambam_starters(deal: BatchDeal) -> np.ndarray:
+    """
+    Resolve the bam-bam phase of every match of a batch at once, with the rule of
+    Match.auto_bambam applied to the private cards: the seat holding the weakest label
+    starts, ties go to more cards of that label, then to the lowest seat.
+
+    Args:
+        deal (BatchDeal): Batch of dealt matches.
+
+    Returns:
+        np.ndarray: Seat that starts each match, shape (matches,).
+    """
+    positions = np.array(CARD_POWER_POSITIONS, dtype=np.int16)[deal.private]
+    weakest = positions.min(axis=2)
+    copies = (positions == weakest[:, :, np.newaxis]).sum(axis=2)
+    return (weakest*BAMBAM_POSITION_WEIGHT - copies).argmin(axis=1)
+
+
+def iter_directors(
+        deal: BatchDeal, names: Sequence[str],
+        seeds: Sequence[int] | None = None) -> Iterator[Director]:
+    """
+    Materialize the matches of a batch, one at a time, as Directors holding a dealt match
+    (not started), ready for engine.play_match with deal=False.
+
+    Args:
+        deal (BatchDeal): Batch of dealt matches.
+        names (Sequence[str]): Names of the players, see engine.create_director.
+        seeds (Sequence[int] | None): Seed of the random generator of each match (used by
+        policies, the deal comes from the batch). Defaults to None (see Match).
+
+    Yields:
+        Iterator[Director]: Director of each match, in batch order.
+    """
+    for index in range(len(deal)):
+        director = create_director(
+            deal.game_mode, names, None if seeds is None else seeds[index])
+        match = director.match
+        match.deck[:] = [FULL_DECK[card_id] for card_id in deal.decks[index].tolist()]
+        for seat, player in enumerate(match.seats):
+            for pile, cards in (
+                    (player.private_cards, deal.private[index, seat]),
+                    (player.open_cards, deal.open[index, seat]),
+                    (player.hidden_cards, deal.hidden[index, seat])):
+                pile.extend(FULL_DECK[card_id] for card_id in cards.tolist())
+        match.dead_pile.extend(FULL_DECK[card_id] for card_id in deal.dead[index].tolist())
+        yield director
@@ -1,23 +1,50 @@
 from __future__ import annotations
 
 import logging
-from collections import deque
 from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, NamedTuple, Sequence
 
-from cartamayor.common.classes import Card, Pile, Player, Team
-from cartamayor.common.constants import CARD_LABELS, MAX_VISIBLE_CARDS
-from cartamayor.common.types import GameMode, PileLocation, Suit
+from cartamayor.common.classes import (
+    FULL_DECK, Card, Initiative, Pile, Player, Team, cards_to_mask)
+from cartamayor.common.constants import KILL_RUN_LENGTH, MAX_VISIBLE_CARDS
+from cartamayor.common.types import GameMode, PileLocation
 from cartamayor.interface import prompt_for_game_mode, prompt_for_FTW_players, prompt_for_FM_teams
 from cartamayor.match import Match
+from cartamayor.profiling import timed
+
+
+Policy = Callable[[Player, Match], Sequence[Card]]
+"""Decision maker for a player: given the player and the match, return the cards to play,
+which must be playable and have the same label."""
+
+
+class TurnRecord(NamedTuple):
+    """Summary of the actions that took place during a turn.
+
+    Parameters:
+        player (Player): player who had the initiative during the turn.
+        played (tuple[Card, ...]): cards played to the table pile, in order of play.
+        picked_up (int): amount of cards picked up from the table pile (0 if none).
+        pile_killed (bool): whether or not the table pile was killed.
+        source (PileLocation): location of the pile the player played from.
+    """
+    player: Player
+    played: tuple[Card, ...]
+    picked_up: int
+    pile_killed: bool
+    source: PileLocation
 
 
 def check_match(func):
+    @wraps(func)
     def wrapper(director, *args, **kwargs):
         if director.match is None:
             logging.error(
-                f"Attempted to call function '{func.__name__}' with no proper Match object")
+                "Attempted to call function '%s' with no proper Match object",
+                func.__name__)
             raise ValueError("Match must be set before using this function")
-        return func(*args, **kwargs)
+        return func(director, *args, **kwargs)
     return wrapper
 
 
@@ -38,17 +65,16 @@ class Director:
     players: list[Player] | None = None
 
     @classmethod
+    @timed("Director.build_deck")
     def build_deck(cls) -> list[Card]:
         """Build the deck of cards to be used during the match.
 
         Returns:
-            list[Card]: deck of 52 cards, ace to king from all 4 suits.
+            list[Card]: deck of 52 cards, ace to king from all 4 suits. The cards are the
+            shared instances from FULL_DECK, so only the list is new.
         """
-        deck = []
-        for suit in Suit:
-            for label in CARD_LABELS:
-                deck.append(Card(label, suit))
-        logging.debug(f"Successfully generated deck with {len(deck)} card(s)")
+        deck = list(FULL_DECK)
+        logging.debug("Successfully generated deck with %d card(s)", len(deck))
         return deck
 
     def _select_game_mode(self) -> GameMode:
@@ -95,20 +121,20 @@ class Director:
             logging.warning("Attempted to create teams and players with no game mode set")
             raise AttributeError("Game Mode doesn't have a valid value")
 
-    def _generate_initiative_queue(self) -> deque[Player]:
+    def _generate_initiative_queue(self) -> Initiative:
         """Use the team or players to create the initiative queue (relative positions).
 
         Raises:
             AttributeError: If both Players and Teams are None.
 
         Returns:
-            deque[Player]: Deque of players, in order (intercalated teams, if any).
+            Initiative: Players in seat order (intercalated teams, if any).
             Note: Absolute position is irrelevant until bam-bam is completed.
         """
         if self.players is not None:
-            return deque(*self.players)
+            return Initiative(self.players)
         elif self.teams is not None:
-            return deque([
+            return Initiative([
                 self.teams[0].players[0],
                 self.teams[1].players[0],
                 self.teams[0].players[1],
@@ -125,22 +151,38 @@ class Director:
         """
         game_mode = self._select_game_mode()
         self._create_teams_and_players(game_mode)
+        return self.build_match(game_mode)
+
+    def build_match(self, game_mode: GameMode, seed: int | None = None) -> Match:
+        """Build a match for the teams or players already set in the Director, with no
+        interaction.
+
+        Args:
+            game_mode (GameMode): Game mode of the match.
+            seed (int | None): Seed of the random generator of the match. Defaults to None
+            (drawn from the global random module, see Match).
+
+        Returns:
+            Match: New match to be controlled by the Director.
+        """
         return Match(
             game_mode,
             self._generate_initiative_queue(),
             self.build_deck(),
             Pile(PileLocation.TABLE),
-            Pile(PileLocation.DEAD))
+            Pile(PileLocation.DEAD),
+            seed=seed)
 
     def start_match(self) -> None:
-        """Create the match object, then start it."""
+        """Create the match object, deal the cards, then start it."""
         self.match = self._create_match()
-        self.match.start()
+        self.match.deal().start()
 
     @check_match
     def get_next_player(self) -> Player:
-        return self.match.initiative_queue[0]
+        return self.match.initiative_queue.current
 
+    @timed("Director.get_table_pile_display")
     def get_table_pile_display(
             self, latest_play: list[Card | None]) -> tuple[int, list[Card | None]]:
         """
@@ -155,7 +197,9 @@ class Director:
 
         Note: This function assumes the pile was killed if that was supposed to happen. That
         is, the function assumes no grouping of 4 equally labeled cards are present in the
-        pile.
+        pile. It also assumes the latest play is on top of the table pile. Previous cards
+        are found from the runs of equally labeled cards tracked by the table pile and only
+        the visible cards are read, so the cost doesn't depend on the size of the pile.
 
         Args:
             latest_play (list[Card]): All cards that were played in the latest turn, in
@@ -167,27 +211,128 @@ class Director:
             that should be visible. "None" replaces cards not visible that are below the
             MAX_VISIBLE_CARDS limit.
         """
-        visible_cards: list[Card | None]
-        visible_cards = latest_play[::-1]
-        table_without_last_play = list(self.match.table_pile)[:-len(latest_play)]
+        table_pile = self.match.table_pile
+        top_label, top_length = table_pile.get_run()
+        same_label_below = top_length - len(latest_play)
         if self.match.control_flags["show_previous_play"]:
-            for card in table_without_last_play[-1:-4:-1]:
-                if card.label == "2":
-                    visible_cards.append(card)
-                else:
-                    break
+            previous_twos = 0
+            if top_label == "2":
+                previous_twos = same_label_below
+            elif not same_label_below:
+                previous_label, previous_length = table_pile.get_run(1)
+                if previous_label == "2":
+                    previous_twos = previous_length
+            extra_cards = min(previous_twos, 3)
         else:
-            for card in table_without_last_play[-1:-3:-1]:
-                if card.label == visible_cards[0].label:
-                    visible_cards.append(card)
+            extra_cards = min(same_label_below, 2)
+        visible_cards: list[Card | None]
+        visible_cards = list(table_pile.top(len(latest_play) + extra_cards))
         visibility = len(visible_cards)
-        masked_table = list(self.match.table_pile)[:-visibility]
         if visibility < MAX_VISIBLE_CARDS:
             visible_cards.extend(
-                [None]*min(len(masked_table), MAX_VISIBLE_CARDS-visibility))
-        return (len(self.match.table_pile), visible_cards)
+                [None]*min(len(table_pile) - visibility, MAX_VISIBLE_CARDS-visibility))
+        return (len(table_pile), visible_cards)
+
+    @timed("Director.play_turn")
+    @check_match
+    def play_turn(self, policy: Policy) -> TurnRecord:
+        """Play a turn of actions and apply the changes to the match.
 
-    def play_turn(self) -> None:
-        """Play a turn of actions and apply the changes to the match."""
-        pass
+        The player with the initiative plays from their current source (see
+        Player.get_source):
+        - From the hidden pile, the top card is played blindly. If it is not playable on
+        the table pile, the player picks it up along with the table pile.
+        - Otherwise, the policy chooses the cards to be played, among the playable ones. If
+        there is none, the player picks up the table pile instead.
+
+        KILL_RUN_LENGTH cards with the same label on top of the table pile kill it (moved
+        to the dead pile) and the player keeps the initiative. The match finishes as soon
+        as a player has no cards left.
+
+        Args:
+            policy (Policy): Decision maker for the player with the initiative. Not called
+            when the player has no choice to make.
+
+        Raises:
+            ValueError: If the policy chooses cards that can't be played.
+
+        Returns:
+            TurnRecord: Summary of the turn.
+        """
+        match = self.match
+        player = match.initiative_queue.current
+        table_pile = match.table_pile
+        source = player.get_source()
+        played: tuple[Card, ...] = ()
+        picked_up = 0
+        if source.location == PileLocation.HIDDEN:
+            card = source.pop()
+            played = (card,)
+            is_playable = not table_pile or card.is_playable_on(table_pile[-1])
+            table_pile.append(card)
+            if not is_playable:
+                picked_up = self._pick_up_table_pile(player)
+        elif source.contains_playable_card(table_pile):
+            played = tuple(policy(player, match))
+            self._validate_play(source, played)
+            source.remove_cards(played)
+            table_pile.extend(played)
+        else:
+            picked_up = self._pick_up_table_pile(player)
+
+        pile_killed = not picked_up and self._kill_table_pile()
+        if not (player.private_cards or player.open_cards or player.hidden_cards):
+            logging.info("Player '%s' has no cards left, finishing match", player.name)
+            match.finish()
+        else:
+            match.update_initiative_queue(pile_killed, reverse=False)
+        return TurnRecord(player, played, picked_up, pile_killed, source.location)
+
+    def _validate_play(self, source: Pile, cards: Sequence[Card]) -> None:
+        """Ensure the cards chosen for a play can be played from the source pile.
+
+        Args:
+            source (Pile): Pile from which the cards would be played.
+            cards (Sequence[Card]): Cards chosen to be played.
+
+        Raises:
+            ValueError: If no card was chosen, if the cards have different labels or if any
+            of them is not a playable card from the source pile.
+        """
+        if not cards:
+            raise ValueError("At least one card must be played")
+        if any(card.rank != cards[0].rank for card in cards):
+            raise ValueError(
+                f"Cards with different labels can't be played together: {cards}")
+        if cards_to_mask(cards) & ~source.get_playable_mask(self.match.table_pile):
+            raise ValueError(f"Cards are not playable from the {source.location.name} pile")
+
+    def _pick_up_table_pile(self, player: Player) -> int:
+        """Move every card from the table pile to the private pile of the player.
+
+        Args:
+            player (Player): Player who picks up the table pile.
+
+        Returns:
+            int: Amount of cards picked up.
+        """
+        table_pile = self.match.table_pile
+        picked_up = len(table_pile)
+        player.private_cards.add_cards(list(table_pile))
+        table_pile.clear()
+        return picked_up
+
+    def _kill_table_pile(self) -> bool:
+        """Kill the table pile, moving it to the dead pile, if its top KILL_RUN_LENGTH cards
+        have the same label.
+
+        Returns:
+            bool: True if the table pile was killed, False otherwise.
+        """
+        table_pile = self.match.table_pile
+        if table_pile.top_run_length < KILL_RUN_LENGTH:
+            return False
+        self.match.dead_pile.extend(table_pile)
+        table_pile.clear()
+        return True
 
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterator, Mapping, NamedTuple, Sequence
+
+from cartamayor.common.classes import Card, Player, Team, mask_to_cards
+from cartamayor.common.constants import RANKS_BY_POWER
+from cartamayor.common.types import GameMode
+from cartamayor.director import Director, Policy
+from cartamayor.match import Match
+from cartamayor.replay import EventLog
+
+
+MAX_TURNS = 10_000
+
+
+class MatchResult(NamedTuple):
+    """Compact summary of a match played by the engine.
+
+    Parameters:
+        winner (str | None): name of the player who got rid of all their cards first, None
+            if the match was interrupted.
+        winning_team (str | None): name of the winner's team (only for FULL_MONTY games).
+        turns (int): amount of turns played.
+        pickups (int): amount of times the table pile was picked up.
+        kills (int): amount of times the table pile was killed.
+        seed (int): seed of the match, from which it can be played again.
+    """
+    winner: str | None
+    winning_team: str | None
+    turns: int
+    pickups: int
+    kills: int
+    seed: int
+
+
+def lowest_label_policy(player: Player, match: Match) -> list[Card]:
+    """Play every card of the weakest playable label.
+
+    Args:
+        player (Player): Player who has the initiative.
+        match (Match): Match being played.
+
+    Returns:
+        list[Card]: Cards to be played.
+    """
+    source = player.get_source()
+    playable = mask_to_cards(source.get_playable_mask(match.table_pile))
+    ranks = {card.rank for card in playable}
+    weakest = next(rank for rank in RANKS_BY_POWER if rank in ranks)
+    return [card for card in playable if card.rank == weakest]
+
+
+def random_policy(player: Player, match: Match) -> list[Card]:
+    """Play a random amount of cards of a random playable label, drawn from the random
+    generator of the match so the match only depends on its seed.
+
+    Args:
+        player (Player): Player who has the initiative.
+        match (Match): Match being played.
+
+    Returns:
+        list[Card]: Cards to be played.
+    """
+    source = player.get_source()
+    playable = mask_to_cards(source.get_playable_mask(match.table_pile))
+    label = match.rng.choice(playable).rank
+    same_label = [card for card in playable if card.rank == label]
+    return same_label[:match.rng.randint(1, len(same_label))]
+
+
+def create_director(
+        game_mode: GameMode, names: Sequence[str], seed: int | None = None) -> Director:
+    """Set up a Director and its match with no interaction.
+
+    Args:
+        game_mode (GameMode): Game mode of the match.
+        names (Sequence[str]): Names of the players. For FULL_MONTY, the first two names
+        form the first team and the last two, the second team.
+        seed (int | None): Seed of the random generator of the match. Defaults to None
+        (drawn from the global random module, see Match).
+
+    Returns:
+        Director: Director holding a new match, neither dealt nor started.
+    """
+    if game_mode == GameMode.FULL_MONTY:
+        director = Director(teams=(
+            Team("Team 1", (Player(names[0]), Player(names[1]))),
+            Team("Team 2", (Player(names[2]), Player(names[3])))))
+    else:
+        director = Director(players=[Player(name) for name in names])
+    director.match = director.build_match(game_mode, seed)
+    return director
+
+
+def play_match(
+        director: Director,
+        policies: Policy | Mapping[str, Policy],
+        max_turns: int = MAX_TURNS,
+        event_log: EventLog | None = None,
+        deal: bool = True) -> MatchResult:
+    """Drive the match of the Director from the deal until a player runs out of cards.
+
+    Args:
+        director (Director): Director holding a match that wasn't dealt yet.
+        policies (Policy | Mapping[str, Policy]): Decision maker for all players, or one
+        for each player name. Policies with an 'observe' method (e.g. ISMCTSPlayer) are
+        given the TurnRecord and the match after every turn.
+        max_turns (int): Amount of turns after which the match is interrupted. Defaults to
+        MAX_TURNS.
+        event_log (EventLog | None): Log where the deal and every turn are recorded, it is
+        not closed. Defaults to None.
+        deal (bool): Whether to deal the match before starting it, False if it was already
+        dealt (e.g. by dealing.iter_directors). Defaults to True.
+
+    Returns:
+        MatchResult: Summary of the match.
+    """
+    match = director.match
+    if deal:
+        match.deal()
+    match.start()
+    observers = {
+        id(policy): policy.observe
+        for policy in ([policies] if callable(policies) else policies.values())
+        if hasattr(policy, "observe")}
+    if event_log is not None:
+        event_log.start(match)
+    turns = pickups = kills = 0
+    record = None
+    while match.ended_at is None and turns < max_turns:
+        player = match.initiative_queue.current
+        policy = policies if callable(policies) else policies[player.name]
+        record = director.play_turn(policy)
+        if event_log is not None:
+            event_log.record_turn(record, match)
+        for observe in observers.values():
+            observe(record, match)
+        turns += 1
+        pickups += record.picked_up > 0
+        kills += record.pile_killed
+    if match.ended_at is None:
+        logging.warning("Match interrupted after %d turn(s)", turns)
+        match.finish()
+        return MatchResult(None, None, turns, pickups, kills, match.seed)
+    winner = record.player
+    winning_team = None
+    if director.teams is not None:
+        winning_team = next(
+            team.name for team in director.teams
+            if any(member is winner for member in team.players))
+    return MatchResult(winner.name, winning_team, turns, pickups, kills, match.seed)
+
+
+def run_matches(
+        count: int,
+        game_mode: GameMode = GameMode.FULL_MONTY,
+        policies: Policy | Mapping[str, Policy] = lowest_label_policy,
+        names: Sequence[str] = ("North", "East", "South", "West"),
+        max_turns: int = MAX_TURNS) -> Iterator[MatchResult]:
+    """Play several complete matches in sequence, with no interaction.
+
+    Args:
+        count (int): Amount of matches to be played.
+        game_mode (GameMode): Game mode of every match. Defaults to FULL_MONTY.
+        policies (Policy | Mapping[str, Policy]): Decision maker for all players, or one
+        for each player name. Defaults to lowest_label_policy.
+        names (Sequence[str]): Names of the players, see create_director.
+        max_turns (int): Amount of turns after which a match is interrupted.
+
+    Yields:
+        Iterator[MatchResult]: Summary of each match, in order of play.
+    """
+    for _ in range(count):
+        yield play_match(create_director(game_mode, names), policies, max_turns)
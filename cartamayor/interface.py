@@ -1,10 +1,18 @@
+from __future__ import annotations
+
 import os
-from collections import deque
+import signal
+import sys
 from datetime import datetime
+from typing import TYPE_CHECKING, Sequence, TextIO
 
 from cartamayor.common.classes import Card, Player
 from cartamayor.common.constants import PILE_COUNTER_LIMIT
 from cartamayor.common.types import GameMode
+from cartamayor.profiling import timed
+
+if TYPE_CHECKING:
+    from cartamayor.match import Match
 
 
 def welcome_users() -> None:
@@ -99,7 +107,58 @@ def prompt_for_FM_teams() -> dict[str, tuple[str, str]]:
     return teams
 
 
-def clear_viewport(clearance=1.2) -> None:
+def prompt_for_play(
+        player: Player,
+        match: Match,
+        renderer: FrameRenderer | TerminalSession | None = None,
+        table_details: tuple[int, list[Card | None]] | None = None) -> list[Card]:
+    """
+    Ask the player which cards to play, among the playable cards from their source.
+
+    Args:
+        player (Player): Player who has the initiative.
+        match (Match): Match being played.
+        renderer (FrameRenderer | TerminalSession | None): If given, the whole screen
+        (match status, table and player state) is drawn as a single frame. Defaults to None
+        (printed below the previous output).
+        table_details (tuple[int, list[Card  |  None]] | None): Table pile details from
+        the Director, see Director.get_table_pile_display. Defaults to None (only the top
+        table card is shown).
+
+    Returns:
+        list[Card]: Cards chosen by the player, all with the same label.
+    """
+    playable = sorted(
+        player.get_playable_cards(match.table_pile), key=lambda card: (card.power, card.id))
+    top_card = str(match.table_pile[-1]) if match.table_pile else "-"
+    lines = []
+    if renderer is not None:
+        lines.extend(render_match_status(
+            match.initiative_queue, match.game_mode, match.started_at))
+    if table_details is not None:
+        lines.extend(render_table(table_details, len(match.dead_pile)))
+    lines.append(f"{player.name}, it's your turn! Top table card: {top_card}")
+    lines.extend(render_detailed_player_state(player))
+    lines.append(
+        "  ".join(f"{number}: {card}" for number, card in enumerate(playable, start=1)))
+    lines.append(
+        '''Type the numbers of the cards to play (same label only), separated by spaces, '''
+        '''then hit "Enter"''')
+    if renderer is None:
+        print("\n".join(lines))
+    else:
+        renderer.render(lines)
+    try:
+        chosen = [playable[int(number) - 1] for number in input("> ").split()]
+    except (ValueError, IndexError):
+        chosen = []
+    if not chosen or any(card.label != chosen[0].label for card in chosen):
+        print("Oops, let's try that again..")
+        return prompt_for_play(player, match, renderer, table_details)
+    return chosen
+
+
+def clear_viewport(clearance=1.2, session: TerminalSession | None = None) -> None:
     """
     Attempt to clear the current terminal window by printing linebreaks to equal the
     current window height.
@@ -107,21 +166,56 @@ def clear_viewport(clearance=1.2) -> None:
     Args:
         clearance (float, optional): Enlarging factor to provide more clearance of the
         viewport. Defaults to 1.2. Values smaller than 1 will be set to 1.
+        session (TerminalSession | None): Terminal session of the match. If given, the
+        screen is cleared with an escape sequence instead (see TerminalSession.clear).
+        Defaults to None.
     """
+    if session is not None:
+        session.clear()
+        return
     clearance = max(1, clearance)
     terminal_height = os.get_terminal_size()[1]
     print("\n"*round(terminal_height*clearance))
 
 
+def prompt_for_handover(player: Player, session: TerminalSession) -> None:
+    """
+    Clear the screen, hiding the cards of the previous player, and wait for the next player
+    to take the terminal (hot-seat play).
+
+    Args:
+        player (Player): Player who is about to play.
+        session (TerminalSession): Terminal session of the match.
+    """
+    clear_viewport(session=session)
+    input(f'Pass the terminal to {player.name}, then hit "Enter" ')
+    # The prompt and the typed input are left on screen, the next frame is drawn anew
+    session.renderer.invalidate()
+
+
+@timed("interface.render_player_state")
+def render_player_state(player: Player) -> list[str]:
+    return [str(player.open_cards), player.hidden_cards.masked(), str(player.private_cards)]
+
+
 def show_player_state(player: Player) -> None:
-    print(player.open_cards)
-    print(player.hidden_cards.masked())
-    print(player.private_cards)
+    print("\n".join(render_player_state(player)))
 
 
 def detailed_player_state(player: Player) -> None:
     """
-    Display a detailed state for the player, with all piles and their cards.
+    Display a detailed state for the player, see 'render_detailed_player_state'.
+
+    Args:
+        player (Player): Player who owns the cards.
+    """
+    print("\n".join(render_detailed_player_state(player)))
+
+
+@timed("interface.render_detailed_player_state")
+def render_detailed_player_state(player: Player) -> list[str]:
+    """
+    Build the lines of a detailed state for the player, with all piles and their cards.
 
     Result will be similar to:
 
@@ -133,6 +227,9 @@ def detailed_player_state(player: Player) -> None:
 
     Args:
         player (Player): Player who owns the cards.
+
+    Returns:
+        list[str]: Lines of the detailed state.
     """
     source_name = player.get_source().location.name.upper()
     rows_to_print = {
@@ -154,8 +251,7 @@ def detailed_player_state(player: Player) -> None:
             len(rows_to_print["PRIVATE"])])
         - len(rows_to_print["BOTTOM_RULE"]) + 1)
     rows_to_print["BOTTOM_RULE"] += "─"*extra_rulers + "┘"
-    for row in rows_to_print.values():
-        print(row.rstrip())
+    return [row.rstrip() for row in rows_to_print.values()]
 
 
 def get_table_display_details(
@@ -187,21 +283,43 @@ def get_table_display_details(
 def show_table(
         table_pile_details: tuple[int, list[Card | None]],
         dead_pile_length: int) -> None:
+    print("\n".join(render_table(table_pile_details, dead_pile_length)))
+
+
+@timed("interface.render_table")
+def render_table(
+        table_pile_details: tuple[int, list[Card | None]],
+        dead_pile_length: int) -> list[str]:
+    """
+    Build the lines of the table display, with the visible cards of the table pile and the
+    dead pile counter.
+
+    Args:
+        table_pile_details (tuple[int, list[Card  |  None]]): Details from the current table
+        pile coming from the Director.
+        dead_pile_length (int): amount of cards in the dead pile.
+
+    Returns:
+        list[str]: Lines of the table display.
+    """
     table_pile_size, cards_to_display, dead_pile_size = get_table_display_details(
         table_pile_details, dead_pile_length)
     JUSTIFY_MARGIN = 9
+    top_card = cards_to_display[0] if cards_to_display else ""
     display_lines = [
         "┌────────────────────────────┐",
-        f"│       TABLE ({table_pile_size}): {cards_to_display[0].ljust(JUSTIFY_MARGIN)}│"
+        f"│       TABLE ({table_pile_size}): {top_card.ljust(JUSTIFY_MARGIN)}│"
         ]
     for card in cards_to_display[1:-1]:
         display_lines.append(f"│         ┆         {card.ljust(JUSTIFY_MARGIN)}│")
+    if cards_to_display:
+        display_lines.append(
+            f"│         └         {cards_to_display[-1].ljust(JUSTIFY_MARGIN)}│")
     display_lines.extend([
-        f"│         └         {cards_to_display[-1].ljust(JUSTIFY_MARGIN)}│",
         "└────────────────────────────┘",
         f"           DEAD ({dead_pile_size})"
         ])
-    print("\n".join(display_lines))
+    return display_lines
 
 
 def trim_long_string(string: str, max_length: int) -> str:
@@ -225,9 +343,26 @@ def trim_long_string(string: str, max_length: int) -> str:
 
 
 def show_match_status(
-        initiative_queue: deque[Player], game_mode: GameMode, start_time: datetime) -> None:
+        initiative_queue: Sequence[Player], game_mode: GameMode,
+        start_time: datetime) -> None:
     """
-    Print the status of the current match, with game mode, when it started and player queue.
+    Print the status of the current match, see 'render_match_status'.
+
+    Args:
+        initiative_queue (Sequence[Player]): Initiative queue of players from the match.
+        game_mode (GameMode): Current game mode of the match.
+        start_time (datetime): Time at which the match was started.
+    """
+    print("\n".join(render_match_status(initiative_queue, game_mode, start_time)))
+
+
+@timed("interface.render_match_status")
+def render_match_status(
+        initiative_queue: Sequence[Player], game_mode: GameMode,
+        start_time: datetime) -> list[str]:
+    """
+    Build the lines of the status of the current match, with game mode, when it started and
+    player queue.
 
     Result will be similar to:
     ┌────────────────────────────────────┐
@@ -243,9 +378,12 @@ def show_match_status(
     └────────────────────────────────────┘
 
     Args:
-        initiative_queue (deque[Player]): Initiative queue of players from the match.
+        initiative_queue (Sequence[Player]): Initiative queue of players from the match.
         game_mode (GameMode): Current game mode of the match.
         start_time (datetime): Time at which the match was started.
+
+    Returns:
+        list[str]: Lines of the match status.
     """
     game_mode_str = ' '.join(game_mode.name.split('_'))
     display_lines = [
@@ -263,4 +401,185 @@ def show_match_status(
         display_lines.append(
             f"│              ╰ {trim_long_string(initiative_queue[3].name, 19).ljust(20)}│")
     display_lines.append("└────────────────────────────────────┘")
-    print("\n".join(display_lines))
+    return display_lines
+
+
+class FrameRenderer:
+    """
+    Render full screens (frames) on an ANSI terminal, writing only the lines that changed
+    since the previous frame.
+
+    The whole output of a frame is built first and written with a single call to the
+    stream, moving the cursor to each changed line. Anything below the frame (e.g. typed
+    input) is erased as well.
+    """
+    CLEAR_SCREEN = "\x1b[H\x1b[2J"
+    CLEAR_LINE = "\x1b[K"
+    CLEAR_BELOW = "\x1b[J"
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        """
+        Args:
+            stream (TextIO | None): Stream of the terminal. Defaults to None (sys.stdout at
+            the time of rendering).
+        """
+        self.stream = stream
+        self._previous: list[str] | None = None
+
+    def invalidate(self) -> None:
+        """Forget the previous frame, so the next one clears the screen and is fully
+        written (e.g. after the screen was changed by something else)."""
+        self._previous = None
+
+    def mark_cleared(self) -> None:
+        """Record that the screen was cleared, so the next frame is fully written without
+        clearing it again."""
+        self._previous = []
+
+    def diff(self, lines: list[str]) -> str:
+        """
+        Build the output that turns the previous frame into the given one.
+
+        Args:
+            lines (list[str]): Lines of the new frame.
+
+        Returns:
+            str: Content and ANSI escape sequences to be written to the terminal.
+        """
+        previous = self._previous
+        output = []
+        if previous is None:
+            output.append(self.CLEAR_SCREEN)
+            previous = []
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                output.append(f"\x1b[{row + 1};1H{line}{self.CLEAR_LINE}")
+        output.append(f"\x1b[{len(lines) + 1};1H{self.CLEAR_BELOW}")
+        return "".join(output)
+
+    @timed("FrameRenderer.render")
+    def render(self, lines: list[str]) -> int:
+        """
+        Write a new frame to the terminal, leaving the cursor right below it.
+
+        Args:
+            lines (list[str]): Lines of the new frame.
+
+        Returns:
+            int: Amount of characters written.
+        """
+        stream = self.stream or sys.stdout
+        output = self.diff(lines)
+        stream.write(output)
+        stream.flush()
+        self._previous = list(lines)
+        return len(output)
+
+
+class TerminalSession:
+    """
+    Terminal used by an interactive match, with its geometry cached and only refreshed when
+    the terminal is resized (SIGWINCH, where available).
+
+    As a context manager, it switches to the alternate screen of the terminal (if asked to)
+    and listens to resizes, restoring both on exit. The screen is cleared with escape
+    sequences instead of 'clear_viewport' linebreaks, and frames are drawn through its
+    FrameRenderer, which is invalidated on every resize or clear.
+    """
+    ENTER_ALTERNATE_SCREEN = "\x1b[?1049h"
+    EXIT_ALTERNATE_SCREEN = "\x1b[?1049l"
+    DEFAULT_SIZE = os.terminal_size((80, 24))
+
+    def __init__(
+            self, stream: TextIO | None = None, alternate_screen: bool = False) -> None:
+        """
+        Args:
+            stream (TextIO | None): Stream of the terminal. Defaults to None (sys.stdout).
+            alternate_screen (bool): Whether to draw on the alternate screen of the
+            terminal, leaving the previous content untouched on exit. Defaults to False.
+        """
+        self.stream = stream or sys.stdout
+        self.alternate_screen = alternate_screen
+        self.renderer = FrameRenderer(self.stream)
+        self._size: os.terminal_size | None = None
+        self._previous_handler = None
+        self._listening = False
+
+    @property
+    def size(self) -> os.terminal_size:
+        """Cached size of the terminal, only queried again after a resize."""
+        if self._size is None:
+            self.refresh()
+        return self._size
+
+    @property
+    def columns(self) -> int:
+        return self.size.columns
+
+    @property
+    def lines(self) -> int:
+        return self.size.lines
+
+    def refresh(self) -> os.terminal_size:
+        """
+        Query the size of the terminal and invalidate the renderer, since the terminal may
+        have rewrapped the previous frame.
+
+        Returns:
+            os.terminal_size: New size of the terminal, DEFAULT_SIZE if the stream isn't a
+            terminal.
+        """
+        try:
+            self._size = os.get_terminal_size(self.stream.fileno())
+        except (AttributeError, OSError, ValueError):
+            self._size = self.DEFAULT_SIZE
+        self.renderer.invalidate()
+        return self._size
+
+    def render(self, lines: list[str]) -> int:
+        """
+        Draw a frame through the renderer, with lines cut to the cached width of the
+        terminal: a wrapped line would shift every row below it and break the diff.
+
+        Args:
+            lines (list[str]): Lines of the new frame.
+
+        Returns:
+            int: Amount of characters written.
+        """
+        columns = self.columns
+        return self.renderer.render([line[:columns] for line in lines])
+
+    def clear(self) -> None:
+        """Clear the screen and move the cursor to its top left corner."""
+        self.stream.write(FrameRenderer.CLEAR_SCREEN)
+        self.stream.flush()
+        self.renderer.mark_cleared()
+
+    def _on_resize(self, signum, frame) -> None:
+        self._size = None
+        self.renderer.invalidate()
+        if callable(self._previous_handler):
+            self._previous_handler(signum, frame)
+
+    def __enter__(self) -> TerminalSession:
+        if hasattr(signal, "SIGWINCH"):
+            try:
+                self._previous_handler = signal.signal(signal.SIGWINCH, self._on_resize)
+                self._listening = True
+            except ValueError:
+                # Signal handlers can only be set from the main thread
+                pass
+        if self.alternate_screen:
+            self.stream.write(self.ENTER_ALTERNATE_SCREEN)
+        self.clear()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.alternate_screen:
+            self.stream.write(self.EXIT_ALTERNATE_SCREEN)
+            self.stream.flush()
+        if self._listening:
+            signal.signal(signal.SIGWINCH, self._previous_handler or signal.SIG_DFL)
+            self._previous_handler = None
+            self._listening = False
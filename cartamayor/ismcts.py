@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+
+from cartamayor.common.classes import Card, Player, cards_to_mask, mask_to_cards
+from cartamayor.common.constants import (
+    CARD_LABELS, DECK_SIZE, INITIAL_PILE_SIZES, KILL_RUN_LENGTH, RANKS_BY_POWER)
+from cartamayor.common.types import GameMode, PileLocation
+from cartamayor.director import TurnRecord
+from cartamayor.match import Match
+from cartamayor.moves import (
+    BLIND, PICK_UP, Move, generate_moves, get_playable_ranks, move_to_cards)
+
+
+FULL_DECK_MASK = (1 << DECK_SIZE) - 1
+EXPLORATION = 0.7
+MAX_ROLLOUT_TURNS = 500
+DEFAULT_TIME_LIMIT = 0.2
+
+
+class RolloutState:
+    """
+    Compact state of a match used for search: only card ranks are kept (suits don't change
+    the rules), as histograms of each private and open pile, stacks of ranks for the hidden
+    piles and a histogram plus the top run for the table pile. The dead pile is not kept.
+
+    Seats follow Match.seats and the initiative queue is an order of seats with the index
+    of the player to move.
+    """
+    __slots__ = (
+        "private", "open", "hidden", "table", "table_size", "top_rank", "top_run",
+        "order", "position", "winner")
+
+    def __init__(
+            self, private: list[list[int]], open_: list[list[int]],
+            hidden: list[list[int]], table: list[int], top_rank: int, top_run: int,
+            order: list[int], position: int = 0) -> None:
+        self.private = private
+        self.open = open_
+        self.hidden = hidden
+        self.table = table
+        self.table_size = sum(table)
+        self.top_rank = top_rank
+        self.top_run = top_run
+        self.order = order
+        self.position = position
+        self.winner = -1
+
+    def copy(self) -> RolloutState:
+        state = RolloutState.__new__(RolloutState)
+        state.private = [counts[:] for counts in self.private]
+        state.open = [counts[:] for counts in self.open]
+        state.hidden = [ranks[:] for ranks in self.hidden]
+        state.table = self.table[:]
+        state.table_size = self.table_size
+        state.top_rank = self.top_rank
+        state.top_run = self.top_run
+        state.order = self.order
+        state.position = self.position
+        state.winner = self.winner
+        return state
+
+    @property
+    def seat(self) -> int:
+        """Seat of the player to move."""
+        return self.order[self.position]
+
+    def _get_source(self, seat: int) -> list[int] | None:
+        """Rank histogram of the source of the seat, None if the source is the hidden
+        pile."""
+        if any(self.private[seat]):
+            return self.private[seat]
+        if any(self.open[seat]):
+            return self.open[seat]
+        return None
+
+    def legal_moves(self) -> list[Move]:
+        """Every move of the player to move, see moves.generate_moves."""
+        return generate_moves(self._get_source(self.seat), self.top_rank)
+
+    def rollout_move(self, rng: random.Random) -> Move:
+        """Pick a move for a simulation: every card of a random playable label."""
+        source = self._get_source(self.seat)
+        if source is None:
+            return BLIND
+        playable = get_playable_ranks(self.top_rank)
+        ranks = [rank for rank in RANKS_BY_POWER if source[rank] and playable >> rank & 1]
+        if not ranks:
+            return PICK_UP
+        rank = ranks[rng.randrange(len(ranks))]
+        return (rank, source[rank])
+
+    def _push(self, rank: int, count: int) -> None:
+        self.table[rank] += count
+        self.table_size += count
+        if rank == self.top_rank:
+            self.top_run += count
+        else:
+            self.top_rank = rank
+            self.top_run = count
+
+    def _clear_table(self) -> None:
+        self.table = [0]*len(CARD_LABELS)
+        self.table_size = 0
+        self.top_rank = -1
+        self.top_run = 0
+
+    def _pick_up(self, seat: int) -> None:
+        private = self.private[seat]
+        for rank, count in enumerate(self.table):
+            private[rank] += count
+        self._clear_table()
+
+    def apply(self, move: Move) -> None:
+        """
+        Play a move for the player to move, following the same rules as
+        Director.play_turn.
+
+        Args:
+            move (Move): Legal move, see 'legal_moves'.
+        """
+        seat = self.seat
+        picked_up = False
+        if move == BLIND:
+            rank = self.hidden[seat].pop()
+            playable = get_playable_ranks(self.top_rank) >> rank & 1
+            self._push(rank, 1)
+            if not playable:
+                self._pick_up(seat)
+                picked_up = True
+        elif move == PICK_UP:
+            self._pick_up(seat)
+            picked_up = True
+        else:
+            rank, count = move
+            self._get_source(seat)[rank] -= count
+            self._push(rank, count)
+        pile_killed = not picked_up and self.top_run >= KILL_RUN_LENGTH
+        if pile_killed:
+            self._clear_table()
+        if not (any(self.private[seat]) or any(self.open[seat]) or self.hidden[seat]):
+            self.winner = seat
+        elif not pile_killed:
+            self.position = (self.position + 1) % len(self.order)
+
+
+class _Node:
+    """Node of the search tree, reached by 'move' of 'seat' from its parent."""
+    __slots__ = ("parent", "move", "seat", "children", "visits", "reward", "available")
+
+    def __init__(
+            self, parent: _Node | None, move: Move | None, seat: int) -> None:
+        self.parent = parent
+        self.move = move
+        self.seat = seat
+        self.children: dict[Move, _Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.available = 0
+
+
+def _ranks_histogram(mask: int) -> list[int]:
+    counts = [0]*len(CARD_LABELS)
+    for card in mask_to_cards(mask):
+        counts[card.rank] += 1
+    return counts
+
+
+def _backpropagate(node: _Node | None, teams: list[int], winning_team: int | None) -> None:
+    """Count a visit in the node and its ancestors, rewarding the nodes played by the
+    winning team (half a win each for simulations cut before the end)."""
+    while node is not None:
+        node.visits += 1
+        if winning_team is None:
+            node.reward += 0.5
+        elif teams[node.seat] == winning_team:
+            node.reward += 1
+        node = node.parent
+
+
+class ISMCTSPlayer:
+    """
+    Computer player that chooses its plays with determinized Information Set Monte Carlo
+    Tree Search (single observer).
+
+    On each iteration, the cards the player can't see (private cards of the opponents not
+    known from their pickups, every hidden pile and the cards dealt to the dead pile) are
+    dealt at random in a RolloutState, and a single tree is searched, only following the
+    moves legal in that deal. The play is the most visited move from the root.
+
+    Instances are policies (see director.Policy): they are called with the player and the
+    match. The 'observe' method keeps track of the cards picked up by each player and should
+    be called after every turn (engine.play_match does so). A single instance can play for
+    several seats, since everything it observes is public. In Full Monty matches, seats 'n'
+    and 'n + 2' are teammates (see Director._generate_initiative_queue) and a team win
+    counts as a win.
+    """
+
+    def __init__(
+            self,
+            time_limit: float | None = DEFAULT_TIME_LIMIT,
+            iterations: int | None = None,
+            exploration: float = EXPLORATION,
+            seed: int | None = None) -> None:
+        """
+        Args:
+            time_limit (float | None): Wall-clock budget of each search, in seconds.
+            Defaults to DEFAULT_TIME_LIMIT.
+            iterations (int | None): Maximum amount of iterations of each search. Defaults
+            to None (only limited by time).
+            exploration (float): Exploration constant of the UCB formula. Defaults to
+            EXPLORATION.
+            seed (int | None): Seed of the random generator of the player. Defaults to None.
+
+        Raises:
+            ValueError: If neither a time limit nor an amount of iterations is given.
+        """
+        if time_limit is None and iterations is None:
+            raise ValueError("A time limit or an amount of iterations is required")
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self._match: Match | None = None
+        self._known: list[int] = []
+        self._table_mask = 0
+
+    def __call__(self, player: Player, match: Match) -> list[Card]:
+        """
+        Choose the cards to be played by the player.
+
+        Args:
+            player (Player): Player who has the initiative.
+            match (Match): Match being played.
+
+        Returns:
+            list[Card]: Cards to be played, all with the same label.
+        """
+        self._sync(match)
+        seat = match.get_seat(player)
+        base = self._build_state(match, seat)
+        moves = base.legal_moves()
+        move = moves[0] if len(moves) == 1 else self.search(match, seat, base)
+        return move_to_cards(move, player)
+
+    def observe(self, record: TurnRecord, match: Match) -> None:
+        """
+        Update what is known about the private cards of each player after a turn: every
+        card picked up from the table pile is known until it is played.
+
+        Args:
+            record (TurnRecord): Summary of the turn, from Director.play_turn.
+            match (Match): Match in which the turn was played.
+        """
+        self._sync(match)
+        seat = match.get_seat(record.player)
+        played = cards_to_mask(record.played)
+        if record.picked_up:
+            self._known[seat] |= self._table_mask | played
+        else:
+            self._known[seat] &= ~played
+        self._table_mask = match.table_pile.mask
+
+    def _sync(self, match: Match) -> None:
+        """Forget everything observed when a new match is played."""
+        if self._match is not match:
+            self._match = match
+            self._known = [0]*len(match.seats)
+            self._table_mask = match.table_pile.mask
+
+    def _build_state(self, match: Match, seat: int) -> RolloutState:
+        """Build the part of the state known by the seat: the private piles of the other
+        seats and every hidden pile are left empty."""
+        seats = len(match.seats)
+        top_label, top_run = match.table_pile.get_run()
+        private = [[0]*len(CARD_LABELS) for _ in range(seats)]
+        private[seat] = _ranks_histogram(match.seats[seat].private_cards.mask)
+        return RolloutState(
+            private,
+            [_ranks_histogram(player.open_cards.mask) for player in match.seats],
+            [[] for _ in range(seats)],
+            list(match.table_pile.rank_counts),
+            -1 if top_label is None else match.table_pile[-1].rank, top_run,
+            [match.get_seat(player) for player in match.initiative_queue])
+
+    def determinize(self, match: Match, seat: int, base: RolloutState) -> RolloutState:
+        """
+        Deal the cards unseen by the seat at random, consistently with what it observed.
+
+        Args:
+            match (Match): Match being played.
+            seat (int): Seat of the observer.
+            base (RolloutState): Known part of the state, see '_build_state'.
+
+        Returns:
+            RolloutState: Possible state of the match.
+        """
+        state = base.copy()
+        dead_dealt = INITIAL_PILE_SIZES[match.game_mode].get(PileLocation.DEAD, 0)
+        seen = match.table_pile.mask | cards_to_mask(list(match.dead_pile)[dead_dealt:])
+        known = []
+        for other, player in enumerate(match.seats):
+            seen |= player.open_cards.mask
+            if other == seat:
+                seen |= player.private_cards.mask
+                known.append(player.private_cards.mask)
+                continue
+            # Knowledge is dropped if it doesn't fit (e.g. turns that weren't observed)
+            other_known = self._known[other] if other < len(self._known) else 0
+            if bin(other_known).count("1") > len(player.private_cards):
+                other_known = 0
+            seen |= other_known
+            known.append(other_known)
+        unseen = [card.rank for card in mask_to_cards(FULL_DECK_MASK & ~seen)]
+        self.rng.shuffle(unseen)
+        for other, player in enumerate(match.seats):
+            private = _ranks_histogram(known[other])
+            missing = len(player.private_cards) - sum(private)
+            for rank in unseen[:missing]:
+                private[rank] += 1
+            del unseen[:missing]
+            state.private[other] = private
+            hidden_size = len(player.hidden_cards)
+            state.hidden[other] = unseen[:hidden_size]
+            del unseen[:hidden_size]
+        return state
+
+    def _get_teams(self, match: Match) -> list[int]:
+        if match.game_mode == GameMode.FULL_MONTY:
+            return [seat % 2 for seat in range(len(match.seats))]
+        return list(range(len(match.seats)))
+
+    def search(self, match: Match, seat: int, base: RolloutState) -> Move:
+        """
+        Search the best move for the seat within the time and iteration budget.
+
+        Args:
+            match (Match): Match being played.
+            seat (int): Seat of the player to move.
+            base (RolloutState): Known part of the state, see '_build_state'.
+
+        Returns:
+            Move: Most visited move from the root.
+        """
+        teams = self._get_teams(match)
+        rng = self.rng
+        root = _Node(None, None, seat)
+        deadline = None
+        if self.time_limit is not None:
+            deadline = time.perf_counter() + self.time_limit
+        iteration = 0
+        # At least one iteration is run, so that the root always has a move to choose
+        while iteration == 0 or (
+                (self.iterations is None or iteration < self.iterations)
+                and (deadline is None or time.perf_counter() < deadline)):
+            iteration += 1
+            state = self.determinize(match, seat, base)
+            node = self._select_and_expand(root, state)
+            # Simulation
+            turns = 0
+            while state.winner < 0 and turns < MAX_ROLLOUT_TURNS:
+                state.apply(state.rollout_move(rng))
+                turns += 1
+            _backpropagate(node, teams, None if state.winner < 0 else teams[state.winner])
+        return max(root.children.values(), key=lambda child: child.visits).move
+
+    def _select_and_expand(self, root: _Node, state: RolloutState) -> _Node:
+        """
+        Walk down the tree, among the moves legal in the deal, and add a node for the first
+        move never tried. The moves are applied to the state along the way.
+
+        Args:
+            root (_Node): Root of the tree.
+            state (RolloutState): Determinized state, see 'determinize'.
+
+        Returns:
+            _Node: Node where the simulation starts.
+        """
+        rng = self.rng
+        exploration = self.exploration
+        node = root
+        while state.winner < 0:
+            moves = state.legal_moves()
+            untried = [move for move in moves if move not in node.children]
+            for move in moves:
+                child = node.children.get(move)
+                if child is not None:
+                    child.available += 1
+            if untried:
+                move = untried[rng.randrange(len(untried))]
+                child = _Node(node, move, state.seat)
+                child.available = 1
+                node.children[move] = child
+                state.apply(move)
+                return child
+            node = max(
+                (node.children[move] for move in moves),
+                key=lambda child: child.reward/child.visits + exploration*math.sqrt(
+                    math.log(child.available)/child.visits))
+            state.apply(node.move)
+        return node
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_match"] = None
+        return state
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+import marshal
+import os
+import queue
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterator
+
+
+LOG_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logging.json")
+COMPILED_CONFIG_PATH = os.path.join(
+    os.path.dirname(LOG_CONFIG_PATH), "__pycache__", "logging.json.marshal")
+
+
+def load_config(path: str = LOG_CONFIG_PATH) -> dict[str, Any]:
+    import json
+
+    with open(path, 'r') as file_:
+        return json.load(file_)
+
+
+def load_compiled_config(
+        path: str = LOG_CONFIG_PATH,
+        compiled_path: str = COMPILED_CONFIG_PATH) -> dict[str, Any]:
+    """
+    Load the logging config from its compiled (marshal) copy, which is much faster than
+    importing json and parsing the file. Like a .pyc file, the copy is rebuilt whenever it
+    is missing or older than the JSON file, and failing to write it is not an error.
+
+    Args:
+        path (str): Path of the JSON config. Defaults to LOG_CONFIG_PATH.
+        compiled_path (str): Path of the compiled copy. Defaults to COMPILED_CONFIG_PATH.
+
+    Returns:
+        dict[str, Any]: Configuration for logging.config.dictConfig.
+    """
+    try:
+        if os.stat(compiled_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            with open(compiled_path, 'rb') as file_:
+                return marshal.load(file_)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    config = load_config(path)
+    # Written aside and then moved, so concurrent starts never read a partial copy
+    partial_path = f"{compiled_path}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        with open(partial_path, 'wb') as file_:
+            marshal.dump(config, file_)
+        os.replace(partial_path, compiled_path)
+    except OSError:
+        logging.debug("Couldn't write the compiled logging config")
+    return config
+
+
+def start_queued_logging(logger: logging.Logger | None = None) -> QueueListener:
+    """
+    Move the handlers of a configured logger behind a queue, so the thread that logs only
+    enqueues records and all the handling (formatting and file I/O) happens in a background
+    thread.
+
+    Each handler keeps its own level and formatter. Records are enqueued with their message
+    already merged with its arguments, so mutable arguments can't change it afterwards.
+
+    Args:
+        logger (logging.Logger | None): Logger whose handlers are moved. Defaults to None
+        (root logger).
+
+    Returns:
+        QueueListener: Started listener, which must be stopped to flush the queue (see
+        'stop_queued_logging').
+    """
+    logger = logger or logging.getLogger()
+    handlers = list(logger.handlers)
+    record_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(record_queue))
+    listener = QueueListener(record_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def stop_queued_logging(
+        listener: QueueListener, logger: logging.Logger | None = None) -> None:
+    """
+    Handle every record still in the queue, stop the background thread and give the
+    handlers back to the logger, so nothing logged afterwards is lost.
+
+    Args:
+        listener (QueueListener): Listener returned by 'start_queued_logging'.
+        logger (logging.Logger | None): Logger given to 'start_queued_logging'. Defaults to
+        None (root logger).
+    """
+    logger = logger or logging.getLogger()
+    listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.flush()
+        logger.addHandler(handler)
+
+
+@contextmanager
+def configured_logging(
+        config: dict[str, Any] | None = None,
+        queued: bool = True) -> Iterator[QueueListener | None]:
+    """
+    Configure logging for the duration of the context.
+
+    Args:
+        config (dict[str, Any] | None): Configuration for logging.config.dictConfig.
+        Defaults to None (loaded from LOG_CONFIG_PATH, see 'load_compiled_config').
+        queued (bool): Whether the root handlers are moved to a background thread, see
+        'start_queued_logging'. Defaults to True.
+
+    Yields:
+        Iterator[QueueListener | None]: Listener of the queue, None if not queued.
+    """
+    import logging.config
+
+    logging.config.dictConfig(config or load_compiled_config())
+    listener = start_queued_logging() if queued else None
+    try:
+        yield listener
+    finally:
+        if listener is not None:
+            stop_queued_logging(listener)
@@ -2,13 +2,41 @@ from __future__ import annotations
 
 import logging
 import random
-from collections import deque
+from copy import copy
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 
-from cartamayor.common.classes import Card, Pile, Player, PileLocation
-from cartamayor.common.constants import INITIAL_PILE_SIZES
+from cartamayor.common.classes import (
+    FULL_DECK, Card, Initiative, Pile, Player, PileLocation)
+from cartamayor.common.constants import (
+    BAMBAM_NO_CARDS_SCORE, BAMBAM_POSITION_WEIGHT, INITIAL_PILE_SIZES, KILL_RUN_LENGTH,
+    LABEL_TO_INDEX, RANK_TO_POWER_POSITION, ZOBRIST_HEAD_KEYS, ZOBRIST_REVERSED_KEY,
+    ZOBRIST_SEAT_PILE_KEYS, ZOBRIST_SHARED_PILE_KEYS, ZOBRIST_TABLE_TOP_KEYS)
 from cartamayor.common.types import GameMode
+from cartamayor.profiling import timed
+
+
+def get_bambam_score(pile: Pile) -> int:
+    """
+    Score a hand for the bam-bam phase, lower is better: the power position of its weakest
+    label, then more cards of that label.
+
+    Args:
+        pile (Pile): Private pile of a player.
+
+    Returns:
+        int: Score of the pile, BAMBAM_NO_CARDS_SCORE if it is empty.
+    """
+    rank = pile.weakest_rank
+    if rank < 0:
+        return BAMBAM_NO_CARDS_SCORE
+    return RANK_TO_POWER_POSITION[rank]*BAMBAM_POSITION_WEIGHT - pile.rank_counts[rank]
+
+
+ENDED_FLAG = 1
+SHOW_PREVIOUS_PLAY_FLAG = 2
+_get_id = attrgetter("id")
 
 
 @dataclass
@@ -19,16 +47,22 @@ class Match:
 
     Parameters:
         game_mode (GameMode): Game mode, as detailed in 'types' module.
-        initiative_queue (deque[Player]): queue of players to control order of play.
+        initiative_queue (Initiative): order of play of the players (any sequence of
+        players is turned into an Initiative on creation, in seat order).
         deck (list[Card]): full deck of cards to be used for the game.
         table_pile (Pile): pile of cards in the table for the match.
         dead_pile (Pile): pile of dead cards, removed from the game.
         control_flags (dict[str, bool]): control flags used for the Match.
         started_at (datetime | None): starting timestamp of the match, naive datetime.
         ended_at (datetime | None): ending timestamp of the match, naive datetime.
+        seed (int | None): seed of the random generator of the match, which shuffles the
+        deck. If None, a seed is drawn from the global random module on creation, so every
+        match can be replayed from its seed alone.
+        seats (tuple[Player, ...]): players in their initial order of the initiative queue,
+        which never changes (set on creation).
     """
     game_mode: GameMode
-    initiative_queue: deque[Player]
+    initiative_queue: Initiative
     deck: list[Card]
     table_pile: Pile
     dead_pile: Pile
@@ -36,6 +70,31 @@ class Match:
     ended_at: datetime | None = None
     control_flags: dict[str, bool] = field(
         default_factory=lambda: dict(show_previous_play=False))
+    seed: int | None = field(default=None, compare=False)
+    seats: tuple[Player, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.seed is None:
+            self.seed = random.getrandbits(64)
+        self._rng: random.Random | None = None
+        if not isinstance(self.initiative_queue, Initiative):
+            self.initiative_queue = Initiative(self.initiative_queue)
+        self.seats = self.initiative_queue.seats
+        self._seat_of = {id(player): seat for seat, player in enumerate(self.seats)}
+        for seat, player in enumerate(self.seats):
+            seat_keys = ZOBRIST_SEAT_PILE_KEYS[seat]
+            for pile in (player.private_cards, player.open_cards, player.hidden_cards):
+                pile.set_hash_keys(seat_keys[pile.location])
+        for pile in (self.table_pile, self.dead_pile):
+            pile.set_hash_keys(ZOBRIST_SHARED_PILE_KEYS[pile.location])
+        self._hashed_piles = self.get_piles()
+
+    @property
+    def rng(self) -> random.Random:
+        """Random generator of the match, seeded with 'seed' when first used."""
+        if self._rng is None:
+            self._rng = random.Random(self.seed)
+        return self._rng
 
     def __str__(self) -> str:
         started_str = "not started"
@@ -46,7 +105,8 @@ class Match:
             f"[{', '.join(player.name for player in self.initiative_queue)}] - "
             f"Top table card: {self.table_pile[-1]} - # Dead: {len(self.dead_pile)}")
 
-    def deal(self) -> Match:
+    @timed("Match.deal")
+    def deal(self, shuffle: bool = True) -> Match:
         """
         Shuffle deck, then deal cards to the players (private, open and hidden), according
         to the game mode.
@@ -54,20 +114,28 @@ class Match:
         Fatal Three Way: 7 private, 5 open and 5 hidden
         Full Monty: 5 private, 4 open and 4 hidden.
         Note: Deck is not emptied for shuffling.
+
+        Args:
+            shuffle (bool): Whether to shuffle the deck before dealing. Defaults to True
+            (False deals the deck in its current order, e.g. for replays).
         """
-        random.shuffle(self.deck)
-        logging.debug(f"Initial deck order: {', '.join(str(card) for card in self.deck)}")
+        if shuffle:
+            self.rng.shuffle(self.deck)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "Initial deck order: %s", ", ".join(str(card) for card in self.deck))
 
         last_hidden_index = 0
-        for index, player in enumerate(self.initiative_queue):
-            last_private_index = index + INITIAL_PILE_SIZES[
+        for player in self.initiative_queue:
+            first_private_index = last_hidden_index
+            last_private_index = first_private_index + INITIAL_PILE_SIZES[
                 self.game_mode][PileLocation.PRIVATE]
             last_open_index = last_private_index + INITIAL_PILE_SIZES[
                 self.game_mode][PileLocation.OPEN]
             last_hidden_index = last_open_index + INITIAL_PILE_SIZES[
                 self.game_mode][PileLocation.HIDDEN]
 
-            player.private_cards.extend(self.deck[index:last_private_index])
+            player.private_cards.extend(self.deck[first_private_index:last_private_index])
             player.open_cards.extend(self.deck[last_private_index:last_open_index])
             player.hidden_cards.extend(self.deck[last_open_index:last_hidden_index])
 
@@ -77,19 +145,27 @@ class Match:
 
         return self
 
+    @timed("Match.auto_bambam")
     def auto_bambam(self) -> Match:
         """
         Perform an automatic bam-bam phase and thus set the starting initiative queue for
         the match.
+
+        The player whose private cards hold the weakest label starts (see
+        RANKS_BY_POWER). Ties go to the player with more cards of that label, then to the
+        earliest in the queue. The order of play is kept, the queue is only rotated. Each
+        player is scored in constant time from the label counters of their private pile.
         """
-        # TODO: implement, really
+        initiative = self.initiative_queue
+        scores = [get_bambam_score(player.private_cards) for player in initiative]
+        initiative.advance(scores.index(min(scores)))
         return self
 
+    @timed("Match.start")
     def start(self) -> Match:
         """
         Set starting attributes and execute auto-bambam.
         """
-        # TODO: implement starting function
         self.started_at = datetime.now()
         self.auto_bambam()
         return self
@@ -106,13 +182,135 @@ class Match:
         Returns:
             Match: self.
         """
-        if not pile_killed and not reverse:
-            self.initiative_queue.rotate(-1)
-        elif reverse:
-            self.initiative_queue.rotate(-1)
+        if reverse:
             self.initiative_queue.reverse()
+        elif not pile_killed:
+            self.initiative_queue.advance()
         return self
 
     def finish(self) -> Match:
         self.ended_at = datetime.now()
         return self
+
+    def get_seat(self, player: Player) -> int:
+        """
+        Get the seat of a player of the match, i.e. their index in 'seats'.
+
+        Args:
+            player (Player): Player of the match.
+
+        Returns:
+            int: Seat of the player.
+        """
+        return self._seat_of[id(player)]
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        64-bit Zobrist hash of the state of the match, for transposition tables and state
+        caches.
+
+        It covers which cards are in each pile, the seat at the head of the initiative
+        queue, the direction of play and the label and length (up to KILL_RUN_LENGTH) of
+        the top run of the table pile. Each pile keeps its own hash up to date as cards
+        move, so this only combines a fixed amount of values.
+
+        Returns:
+            int: Hash of the current state.
+        """
+        zobrist_hash = 0
+        for pile in self._hashed_piles:
+            zobrist_hash ^= pile.zobrist_hash
+        initiative = self.initiative_queue
+        if self.seats:
+            zobrist_hash ^= ZOBRIST_HEAD_KEYS[initiative.head]
+            if len(self.seats) > 2 and initiative.direction < 0:
+                zobrist_hash ^= ZOBRIST_REVERSED_KEY
+        top_label, top_length = self.table_pile.get_run()
+        if top_label is not None:
+            zobrist_hash ^= ZOBRIST_TABLE_TOP_KEYS[LABEL_TO_INDEX[top_label]][
+                min(top_length, KILL_RUN_LENGTH) - 1]
+        return zobrist_hash
+
+    def get_piles(self) -> list[Pile]:
+        """Get every pile of the match: private, open and hidden for each seat (in seat
+        order), then the table and the dead piles."""
+        piles = []
+        for player in self.seats:
+            piles.extend((player.private_cards, player.open_cards, player.hidden_cards))
+        piles.extend((self.table_pile, self.dead_pile))
+        return piles
+
+    def snapshot(self) -> bytes:
+        """
+        Pack the state of the match, which can be set back with 'restore'.
+
+        The state is made of the order of the initiative queue (as seat indexes), a byte of
+        flags (ended, show_previous_play) and the card ids of every pile (see 'get_piles'),
+        each pile prefixed by its length. Timestamps and the deck are not included.
+
+        Returns:
+            bytes: Packed state.
+        """
+        initiative = self.initiative_queue
+        state = bytearray(initiative.get_seat(index) for index in range(len(self.seats)))
+        state.append(
+            (self.ended_at is not None)*ENDED_FLAG
+            | self.control_flags["show_previous_play"]*SHOW_PREVIOUS_PLAY_FLAG)
+        for pile in self.get_piles():
+            state.append(len(pile))
+            state.extend(map(_get_id, pile))
+        return bytes(state)
+
+    def restore(self, state: bytes | memoryview) -> Match:
+        """
+        Set a state packed by 'snapshot' from this match (or any match with the same
+        amount of seats).
+
+        If the state was packed before the match ended, the match is no longer ended.
+
+        Args:
+            state (bytes | memoryview): Packed state.
+
+        Returns:
+            Match: self.
+        """
+        seats = len(self.seats)
+        self.initiative_queue.set_order(state[:seats])
+        flags = state[seats]
+        self.control_flags["show_previous_play"] = bool(flags & SHOW_PREVIOUS_PLAY_FLAG)
+        if not flags & ENDED_FLAG:
+            self.ended_at = None
+        elif self.ended_at is None:
+            self.finish()
+        offset = seats + 1
+        for pile in self.get_piles():
+            end = offset + 1 + state[offset]
+            pile.reset([FULL_DECK[card_id] for card_id in state[offset + 1:end]])
+            offset = end
+        return self
+
+    def clone(self) -> Match:
+        """
+        Copy the match, with new players and piles, so the copy can be changed (e.g. by
+        search algorithms) without changing this match. Cards are shared and the random
+        generator of the copy continues from the current state of this one.
+
+        Returns:
+            Match: Independent copy of the match.
+        """
+        players = {
+            id(player): Player(
+                player.name, copy(player.private_cards), copy(player.open_cards),
+                copy(player.hidden_cards))
+            for player in self.seats}
+        match = Match(
+            self.game_mode, Initiative(players[id(player)] for player in self.seats),
+            list(self.deck), copy(self.table_pile), copy(self.dead_pile),
+            self.started_at, self.ended_at, dict(self.control_flags), self.seed)
+        if self._rng is not None:
+            match._rng = random.Random.__new__(random.Random)
+            match._rng.setstate(self._rng.getstate())
+        match.initiative_queue.head = self.initiative_queue.head
+        match.initiative_queue.direction = self.initiative_queue.direction
+        return match
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from cartamayor.common.classes import Card, Player, mask_to_cards
+from cartamayor.common.constants import (
+    CARD_LABELS, DECK_SIZE, PLAYABLE_RANKS_MASK, RANKS_BY_POWER, SUIT_TO_INDEX)
+from cartamayor.common.types import PileLocation
+from cartamayor.match import Match
+
+
+Move = tuple[int, int]
+"""A move as (rank, amount of cards): play that many cards with the label index 'rank'."""
+
+PICK_UP: Move = (-1, 0)
+"""Move of picking up the table pile, when no card is playable."""
+BLIND: Move = (-1, 1)
+"""Move of playing the top card of the hidden pile."""
+
+ALL_RANKS_MASK = (1 << len(CARD_LABELS)) - 1
+
+# Card set (bitmask, see Card.bit) of the cards of each rank
+RANK_CARDS_MASK = tuple(
+    sum(1 << (suit_index*len(CARD_LABELS) + rank) for suit_index in SUIT_TO_INDEX.values())
+    for rank in range(len(CARD_LABELS)))
+
+# Every move of each rank, by amount of cards, built once so generating moves only
+# allocates the resulting list
+MOVES_BY_RANK = tuple(
+    tuple((rank, count) for count in range(1, DECK_SIZE + 1))
+    for rank in range(len(CARD_LABELS)))
+
+
+def get_playable_ranks(top_rank: int) -> int:
+    """
+    Get the ranks playable on top of the table pile.
+
+    Args:
+        top_rank (int): Rank of the top card of the table pile, -1 if it is empty.
+
+    Returns:
+        int: Ranks as bits of a 13-bit mask.
+    """
+    if top_rank < 0:
+        return ALL_RANKS_MASK
+    return PLAYABLE_RANKS_MASK[top_rank]
+
+
+def generate_moves(rank_counts: Sequence[int] | None, top_rank: int) -> list[Move]:
+    """
+    Generate every legal move from the rank histogram of the source pile of a player.
+
+    Moves are groups of cards with the same label, from the weakest label to the strongest
+    (see RANKS_BY_POWER) and from 1 card to all of them. If no card is playable, the only
+    move is PICK_UP.
+
+    Args:
+        rank_counts (Sequence[int] | None): Amount of cards of each rank in the source
+        pile, None if the source is the hidden pile (the only move is BLIND).
+        top_rank (int): Rank of the top card of the table pile, -1 if it is empty.
+
+    Returns:
+        list[Move]: Legal moves, in a deterministic order.
+    """
+    if rank_counts is None:
+        return [BLIND]
+    playable = get_playable_ranks(top_rank)
+    moves: list[Move] = []
+    for rank in RANKS_BY_POWER:
+        count = rank_counts[rank]
+        if count and playable >> rank & 1:
+            moves.extend(MOVES_BY_RANK[rank][:count])
+    return moves or [PICK_UP]
+
+
+def get_legal_moves(player: Player, match: Match) -> list[Move]:
+    """
+    Generate every legal move of the player, see 'generate_moves'.
+
+    Args:
+        player (Player): Player who has the initiative.
+        match (Match): Match being played.
+
+    Returns:
+        list[Move]: Legal moves, in a deterministic order.
+    """
+    source = player.get_source()
+    table_pile = match.table_pile
+    top_rank = table_pile[-1].rank if table_pile else -1
+    if source.location == PileLocation.HIDDEN:
+        return generate_moves(None, top_rank)
+    return generate_moves(source.rank_counts, top_rank)
+
+
+def move_to_cards(move: Move, player: Player) -> list[Card]:
+    """
+    Choose the cards of the source pile of the player that make a move, in card id order.
+
+    Args:
+        move (Move): Legal move of the player, other than PICK_UP.
+        player (Player): Player who has the initiative.
+
+    Returns:
+        list[Card]: Cards to be played.
+    """
+    source = player.get_source()
+    if move == BLIND:
+        return [source[-1]]
+    rank, count = move
+    return mask_to_cards(source.mask & RANK_CARDS_MASK[rank])[:count]
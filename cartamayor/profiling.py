@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter_ns
+from typing import Iterator, NamedTuple
+
+
+class PhaseSummary(NamedTuple):
+    """Timing statistics of a phase, in nanoseconds.
+
+    Parameters:
+        phase (str): name of the phase.
+        count (int): amount of times the phase ran.
+        total (int): total time spent in the phase.
+        p50 (int): median duration.
+        p99 (int): 99th percentile of the duration.
+    """
+    phase: str
+    count: int
+    total: int
+    p50: int
+    p99: int
+
+
+class PhaseProfile:
+    """Durations of every timed phase (see 'timed') while the profile is active."""
+
+    def __init__(self) -> None:
+        self.durations: defaultdict[str, list[int]] = defaultdict(list)
+
+    def record(self, phase: str, duration: int) -> None:
+        self.durations[phase].append(duration)
+
+    def summarize(self) -> list[PhaseSummary]:
+        """
+        Compute the statistics of each phase.
+
+        Returns:
+            list[PhaseSummary]: Statistics, from the phase with the most total time.
+        """
+        summaries = []
+        for phase, durations in self.durations.items():
+            durations = sorted(durations)
+            summaries.append(PhaseSummary(
+                phase, len(durations), sum(durations),
+                get_percentile(durations, 0.5), get_percentile(durations, 0.99)))
+        return sorted(summaries, key=lambda summary: -summary.total)
+
+    def render(self) -> list[str]:
+        """Build the lines of a table with the statistics of each phase, in milliseconds."""
+        lines = [
+            f"{'Phase':<36}{'count':>8}{'total (ms)':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}"]
+        for phase, count, total, p50, p99 in self.summarize():
+            lines.append(
+                f"{phase:<36}{count:>8}{total/1e6:>12.3f}{p50/1e6:>11.4f}{p99/1e6:>11.4f}")
+        return lines
+
+
+_active_profile: PhaseProfile | None = None
+
+
+def get_percentile(values: list[int], fraction: float) -> int:
+    """Get a percentile of sorted values (nearest rank), 0 if there are none."""
+    if not values:
+        return 0
+    return values[max(math.ceil(fraction*len(values)), 1) - 1]
+
+
+def timed(phase: str):
+    """
+    Decorator that records the duration of every call in the active PhaseProfile. With no
+    active profile, the only cost is a global lookup and an extra call.
+
+    Args:
+        phase (str): Name of the phase the decorated function runs.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active_profile
+            if profile is None:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.record(phase, perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profiling_phases(profile: PhaseProfile | None = None) -> Iterator[PhaseProfile]:
+    """
+    Record the timed phases for the duration of the context.
+
+    Args:
+        profile (PhaseProfile | None): Profile where durations are recorded. Defaults to
+        None (a new profile).
+
+    Yields:
+        Iterator[PhaseProfile]: Active profile.
+    """
+    global _active_profile
+    previous = _active_profile
+    _active_profile = profile = profile or PhaseProfile()
+    try:
+        yield profile
+    finally:
+        _active_profile = previous
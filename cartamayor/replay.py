@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import struct
+from bisect import bisect_right
+from enum import IntEnum
+from typing import BinaryIO, Iterator, NamedTuple
+
+from cartamayor.common.classes import FULL_DECK, Initiative, Pile, Player
+from cartamayor.common.constants import DECK_SIZE
+from cartamayor.common.types import GameMode, PileLocation
+from cartamayor.director import TurnRecord
+from cartamayor.match import Match
+
+
+MAGIC = b"CMEV"
+INDEX_MAGIC = b"CMIX"
+VERSION = 1
+SNAPSHOT_INTERVAL = 32
+NO_CARD = 0xFF
+
+HEADER = struct.Struct("<4sBBBH")
+"""magic, version, game mode, amount of seats, snapshot interval."""
+RECORD = struct.Struct("<BBBB4s")
+"""kind, seat, source pile, amount of cards, card ids (or seat indexes), 0xFF padded."""
+INDEX_ENTRY = struct.Struct("<III")
+"""turn, record number after the turn, offset of the snapshot in the snapshot section."""
+FOOTER = struct.Struct("<II4s")
+"""amount of index entries, offset of the snapshot section, index magic."""
+
+
+class EventKind(IntEnum):
+    """
+    PLAY: cards played from a pile of the seat to the table pile.
+    PICKUP: table pile picked up by the seat.
+    KILL: table pile killed (moved to the dead pile), the amount of cards is the size of the
+    dead pile after the kill.
+    INITIATIVE: order of the initiative queue after a turn, it closes the turn.
+    FINISH: the seat ran out of cards and the match finished, it closes the last turn.
+    """
+    PLAY = 1
+    PICKUP = 2
+    KILL = 3
+    INITIATIVE = 4
+    FINISH = 5
+
+
+TURN_CLOSING_KINDS = (EventKind.INITIATIVE, EventKind.FINISH)
+
+
+class Event(NamedTuple):
+    """Decoded fixed-width record of the event log.
+
+    Parameters:
+        kind (EventKind): kind of the event.
+        seat (int): index of the seat (see Match.seats) who triggered the event.
+        source (int): PileLocation value of the source pile (PLAY only).
+        count (int): amount of cards involved, see EventKind.
+        cards (tuple[int, ...]): card ids played (PLAY) or seat indexes of the initiative
+        queue (INITIATIVE).
+    """
+    kind: EventKind
+    seat: int
+    source: int
+    count: int
+    cards: tuple[int, ...]
+
+
+def encode_record(
+        kind: EventKind, seat: int, source: int = 0, items: tuple[int, ...] = (),
+        count: int | None = None) -> bytes:
+    count = len(items) if count is None else count
+    return RECORD.pack(kind, seat, source, count, bytes(items).ljust(4, bytes([NO_CARD])))
+
+
+def decode_record(data: bytes | memoryview, offset: int = 0) -> Event:
+    kind, seat, source, count, items = RECORD.unpack_from(data, offset)
+    return Event(EventKind(kind), seat, source, count, tuple(items[:min(count, 4)]))
+
+
+class EventLog:
+    """
+    Append-only binary log of the events of a match, written to a binary stream.
+
+    The header holds the game mode, the seat names, the starting order of the initiative
+    queue and the dealt deck order. It is followed by fixed-width records (see RECORD), one
+    per event. On close, a snapshot of the match state every 'snapshot_interval' turns and
+    the index of those snapshots are appended, so a replay can seek to any turn. A log that
+    wasn't closed can still be replayed from its start.
+    """
+
+    def __init__(
+            self, stream: BinaryIO, snapshot_interval: int = SNAPSHOT_INTERVAL) -> None:
+        """
+        Args:
+            stream (BinaryIO): Stream where the log is written, it is left open on close.
+            snapshot_interval (int): Amount of turns between snapshots. Defaults to
+            SNAPSHOT_INTERVAL.
+        """
+        if not 0 < snapshot_interval < 2**16:
+            raise ValueError(f"Invalid snapshot interval: {snapshot_interval}")
+        self.stream = stream
+        self.snapshot_interval = snapshot_interval
+        self.turns = 0
+        self._records = 0
+        self._seat_of: dict[int, int] = {}
+        self._snapshots: list[tuple[int, int, bytes]] = []
+
+    def start(self, match: Match) -> None:
+        """
+        Write the header of the log for a match that was already dealt.
+
+        Args:
+            match (Match): Match to be logged.
+        """
+        self._seat_of = {id(player): seat for seat, player in enumerate(match.seats)}
+        header = bytearray(HEADER.pack(
+            MAGIC, VERSION, match.game_mode.value, len(match.seats),
+            self.snapshot_interval))
+        for player in match.seats:
+            name = player.name.encode()[:255]
+            header.append(len(name))
+            header.extend(name)
+        initiative = match.initiative_queue
+        header.extend(initiative.get_seat(index) for index in range(len(initiative)))
+        header.extend(card.id for card in match.deck)
+        self.stream.write(header)
+
+    def record_turn(self, record: TurnRecord, match: Match) -> None:
+        """
+        Append the events of a turn that was just played.
+
+        Args:
+            record (TurnRecord): Summary of the turn, from Director.play_turn.
+            match (Match): Match in which the turn was played.
+        """
+        seat = self._seat_of[id(record.player)]
+        records = []
+        if record.played:
+            records.append(encode_record(
+                EventKind.PLAY, seat, record.source.value,
+                tuple(card.id for card in record.played)))
+        if record.picked_up:
+            records.append(encode_record(EventKind.PICKUP, seat, count=record.picked_up))
+        if record.pile_killed:
+            records.append(encode_record(
+                EventKind.KILL, seat, count=len(match.dead_pile)))
+        if match.ended_at is not None:
+            records.append(encode_record(EventKind.FINISH, seat))
+        else:
+            initiative = match.initiative_queue
+            order = tuple(initiative.get_seat(index) for index in range(len(initiative)))
+            records.append(encode_record(EventKind.INITIATIVE, order[0], items=order))
+        self.stream.write(b"".join(records))
+        self._records += len(records)
+        self.turns += 1
+        if self.turns % self.snapshot_interval == 0 and match.ended_at is None:
+            self._snapshots.append((self.turns, self._records, match.snapshot()))
+
+    def close(self) -> None:
+        """Append the snapshots and their index, finishing the log."""
+        index = []
+        snapshot_offset = 0
+        for turn, records, state in self._snapshots:
+            index.append(INDEX_ENTRY.pack(turn, records, snapshot_offset))
+            snapshot_offset += len(state)
+        section_offset = self.stream.tell()
+        self.stream.write(b"".join(state for _, _, state in self._snapshots))
+        self.stream.write(b"".join(index))
+        self.stream.write(FOOTER.pack(len(index), section_offset, INDEX_MAGIC))
+        self.stream.flush()
+
+    def __enter__(self) -> EventLog:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MatchReplay:
+    """
+    Reader of an event log, which rebuilds the state of the match at any turn from the
+    closest previous snapshot.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Args:
+            data (bytes): Content of the event log.
+
+        Raises:
+            ValueError: If the data is not an event log of a supported version.
+        """
+        self.data = memoryview(data)
+        magic, version, game_mode, seats, self.snapshot_interval = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a supported match event log")
+        self.game_mode = GameMode(game_mode)
+        offset = HEADER.size
+        names = []
+        for _ in range(seats):
+            length = data[offset]
+            names.append(bytes(data[offset + 1:offset + 1 + length]).decode())
+            offset += 1 + length
+        self.names = tuple(names)
+        self.initiative = tuple(data[offset:offset + seats])
+        offset += seats
+        self.deal = tuple(data[offset:offset + DECK_SIZE])
+        self._events_offset = offset + DECK_SIZE
+
+        events_end = len(data)
+        self._index: list[tuple[int, int, int]] = []
+        self._snapshot_ends: list[int] = []
+        if len(data) >= self._events_offset + FOOTER.size:
+            entries, section_offset, index_magic = FOOTER.unpack_from(
+                data, len(data) - FOOTER.size)
+            if index_magic == INDEX_MAGIC:
+                index_offset = len(data) - FOOTER.size - entries*INDEX_ENTRY.size
+                self._index = [
+                    INDEX_ENTRY.unpack_from(data, index_offset + entry*INDEX_ENTRY.size)
+                    for entry in range(entries)]
+                self._snapshot_ends = [
+                    *(start for _, _, start in self._index[1:]),
+                    index_offset - section_offset]
+                events_end = section_offset
+        self.records = (events_end - self._events_offset)//RECORD.size
+        self._snapshots_offset = self._events_offset + self.records*RECORD.size
+        kinds = self.data[self._events_offset:self._snapshots_offset:RECORD.size].tobytes()
+        self.turns = sum(kinds.count(kind) for kind in TURN_CLOSING_KINDS)
+
+    @classmethod
+    def from_file(cls, path: str) -> MatchReplay:
+        with open(path, "rb") as file_:
+            return cls(file_.read())
+
+    def events(self, start: int = 0) -> Iterator[Event]:
+        """
+        Decode the records of the log.
+
+        Args:
+            start (int): Number of the first record. Defaults to 0.
+
+        Yields:
+            Iterator[Event]: Each event, in order.
+        """
+        for record in range(start, self.records):
+            yield decode_record(self.data, self._events_offset + record*RECORD.size)
+
+    def build_match(self) -> Match:
+        """Build the match right after the deal, before its first turn."""
+        players = [Player(name) for name in self.names]
+        match = Match(
+            self.game_mode, Initiative(players),
+            [FULL_DECK[card_id] for card_id in self.deal],
+            Pile(PileLocation.TABLE), Pile(PileLocation.DEAD))
+        match.deal(shuffle=False)
+        match.initiative_queue.set_order(self.initiative)
+        return match
+
+    def state_at(self, turn: int) -> Match:
+        """
+        Rebuild the match as it was after the given amount of turns, restoring the closest
+        previous snapshot and applying only the events after it.
+
+        Args:
+            turn (int): Amount of turns played, from 0 to 'turns'.
+
+        Raises:
+            ValueError: If the turn is not in the log.
+
+        Returns:
+            Match: New match with the state after the turn.
+        """
+        if not 0 <= turn <= self.turns:
+            raise ValueError(f"Turn {turn} is not in the log (0 to {self.turns})")
+        match = self.build_match()
+        current_turn = record = 0
+        position = bisect_right(self._index, (turn, self.records, 2**32)) - 1
+        if position >= 0:
+            current_turn, record, start = self._index[position]
+            end = self._snapshot_ends[position]
+            snapshots = self.data[self._snapshots_offset:]
+            match.restore(snapshots[start:end])
+        events = self.events(record)
+        while current_turn < turn:
+            event = next(events)
+            apply_event(match, event)
+            current_turn += event.kind in TURN_CLOSING_KINDS
+        return match
+
+
+def apply_event(match: Match, event: Event) -> Match:
+    """
+    Apply a logged event to the match.
+
+    Args:
+        match (Match): Match in the state previous to the event.
+        event (Event): Event to be applied.
+
+    Raises:
+        ValueError: If a played card is not in its source pile.
+
+    Returns:
+        Match: The given match.
+    """
+    player = match.seats[event.seat]
+    table_pile = match.table_pile
+    if event.kind == EventKind.PLAY:
+        cards = [FULL_DECK[card_id] for card_id in event.cards]
+        if event.source == PileLocation.HIDDEN.value:
+            if player.hidden_cards[-1] != cards[0]:
+                raise ValueError(f"Card {cards[0]} is not on top of the hidden pile")
+            player.hidden_cards.pop()
+        elif event.source == PileLocation.OPEN.value:
+            player.open_cards.remove_cards(cards)
+        else:
+            player.private_cards.remove_cards(cards)
+        table_pile.extend(cards)
+    elif event.kind == EventKind.PICKUP:
+        player.private_cards.add_cards(list(table_pile))
+        table_pile.clear()
+    elif event.kind == EventKind.KILL:
+        match.dead_pile.extend(table_pile)
+        table_pile.clear()
+    elif event.kind == EventKind.INITIATIVE:
+        match.initiative_queue.set_order(event.cards)
+    else:
+        match.finish()
+    return match
@@ -1,33 +1,131 @@
 #! /usr/bin/env python3.11
-import json
+from __future__ import annotations
+
 import logging
-import logging.config
+import os
+import sys
 from argparse import ArgumentParser
-from pathlib import Path
+from typing import TYPE_CHECKING
+
+from cartamayor.logs import configured_logging
+
+if TYPE_CHECKING:
+    from cartamayor.director import Director
 
-from cartamayor.director import Director
-from cartamayor.interface import welcome_users
+
+# Modules loaded by the entry point before the first prompt, see 'profile_startup'
+STARTUP_MODULES = ("cartamayor.run", "cartamayor.director")
 
 
 def main(args):
-    path_to_log_config = Path(
-        Path(__file__).parent, "logging").with_suffix(".json").resolve()
-    with open(path_to_log_config, 'r') as file_:
-        config = json.load(file_)
-    logging.config.dictConfig(config)
-    if args.quiet == 1:
-        logging.getLogger().setLevel(logging.INFO)
-    elif args.quiet == 2:
-        logging.getLogger().setLevel(logging.WARNING)
-    elif args.quiet >= 3:
-        logging.getLogger().setLevel(logging.ERROR)
-    logging.debug("Logger successfully started")
+    if args.startup_profile:
+        print("\n".join(profile_startup()))
+        return
+    with configured_logging(queued=not args.sync_logging):
+        if args.quiet == 1:
+            logging.getLogger().setLevel(logging.INFO)
+        elif args.quiet == 2:
+            logging.getLogger().setLevel(logging.WARNING)
+        elif args.quiet >= 3:
+            logging.getLogger().setLevel(logging.ERROR)
+        logging.debug("Logger successfully started")
+        # Imported once arguments and logging are set up, so '--help', '--startup-profile'
+        # and argument errors don't pay for the game modules
+        from cartamayor.director import Director
+
+        if args.profile is None:
+            play(Director())
+        else:
+            profile_play(Director(), args.profile)
+
+
+def play(director: Director) -> None:
+    from cartamayor.interface import (
+        TerminalSession, prompt_for_handover, prompt_for_play, welcome_users)
 
     welcome_users()
-    director = Director()
     director.start_match()
-    while director.match.ended_at is None:
-        director.play_turn()
+    latest_play = []
+    holder = None
+
+    def policy(player, match):
+        nonlocal holder
+        # Hot seat: the screen is cleared whenever the terminal changes hands
+        if player is not holder:
+            prompt_for_handover(player, terminal)
+            holder = player
+        return prompt_for_play(
+            player, match, renderer=terminal,
+            table_details=director.get_table_pile_display(latest_play))
+
+    with TerminalSession() as terminal:
+        while director.match.ended_at is None:
+            record = director.play_turn(policy)
+            latest_play = (
+                [] if record.picked_up or record.pile_killed else list(record.played))
+
+
+def profile_play(director: Director, path: str) -> None:
+    """
+    Play a session under cProfile, recording the timed phases (see profiling.timed). The
+    cProfile stats are dumped to a file (readable with pstats) and the summary of the
+    phases is printed once the session ends.
+
+    Args:
+        director (Director): Director of the session.
+        path (str): Path of the cProfile stats dump.
+    """
+    import cProfile
+
+    from cartamayor.profiling import profiling_phases
+
+    profiler = cProfile.Profile()
+    with profiling_phases() as phases:
+        try:
+            profiler.runcall(play, director)
+        finally:
+            profiler.dump_stats(path)
+            print("\n".join(phases.render()))
+            print(f"cProfile stats saved to {path}")
+
+
+def profile_startup(top: int = 15) -> list[str]:
+    """
+    Measure the import time of the entry point in a fresh interpreter (python -X importtime)
+    and summarize it.
+
+    Args:
+        top (int): Amount of modules listed by their own import time. Defaults to 15.
+
+    Returns:
+        list[str]: Lines of the report: the total, the cumulative time of each package
+        imported directly and the slowest modules.
+    """
+    import subprocess
+
+    code = "; ".join(f"import {module}" for module in STARTUP_MODULES)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True, cwd=root).stderr
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()))//2
+        timings.append((name.strip(), depth, int(own), int(cumulative)))
+    total = sum(own for _, _, own, _ in timings)
+    lines = [f"Startup imports: {len(timings)} modules in {total/1000:.1f} ms", ""]
+    lines.append(f"{'Imported directly':<40}{'cumulative (ms)':>16}")
+    direct = sorted(
+        (timing for timing in timings if timing[1] == 0), key=lambda timing: -timing[3])
+    lines.extend(f"{name:<40}{cumulative/1000:>16.2f}" for name, _, _, cumulative in direct)
+    lines.append("")
+    lines.append(f"{'Slowest modules':<40}{'self (ms)':>16}")
+    slowest = sorted(timings, key=lambda timing: -timing[2])[:top]
+    lines.extend(f"{name:<40}{own/1000:>16.2f}" for name, _, own, _ in slowest)
+    return lines
 
 
 if __name__ == '__main__':
@@ -35,6 +133,16 @@ if __name__ == '__main__':
     parser.add_argument(
         "-q", "--quiet", action="count", default=0,
         help="quiet mode, for less outputs, stackable up to 3 times")
+    parser.add_argument(
+        "--sync-logging", action="store_true",
+        help="write logs from the game thread instead of a background thread")
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="profile the session: dump cProfile stats to PATH and print the time spent in "
+        "each phase")
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="report the import time of the startup, by module, and exit")
     try:
         main(parser.parse_args())
     except KeyboardInterrupt:
@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+from argparse import ArgumentParser
+from typing import Any, Awaitable, Callable, Sequence
+
+from cartamayor.common.classes import FULL_DECK, Card, Player
+from cartamayor.common.constants import CARD_LABELS
+from cartamayor.common.types import GameMode
+from cartamayor.director import Director
+from cartamayor.engine import MAX_TURNS, create_director
+from cartamayor.interface import FrameRenderer, render_table
+from cartamayor.match import Match
+from cartamayor.moves import BLIND, PICK_UP, Move, get_legal_moves, move_to_cards
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7890
+
+View = dict[str, Any]
+"""State of a match as seen by one player, made only of JSON types (cards as ids)."""
+Chooser = Callable[[View, list[Move]], Move | Awaitable[Move]]
+"""Decision maker of a client: given its view and the legal moves, return a move."""
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode_message(line: bytes) -> dict[str, Any]:
+    """Decode a JSON line, raising ValueError if it is not a JSON object."""
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("Message is not a JSON object")
+    return message
+
+
+def build_view(
+        match: Match, player: Player,
+        table_details: tuple[int, list[Card | None]]) -> View:
+    """
+    Build the view of the match for a player: their own private cards, every open pile,
+    the size of every pile and the visible cards of the table pile.
+
+    Args:
+        match (Match): Match being played.
+        player (Player): Player who owns the view.
+        table_details (tuple[int, list[Card  |  None]]): Table pile details from the
+        Director, see Director.get_table_pile_display.
+
+    Returns:
+        View: View of the player.
+    """
+    table_size, table_cards = table_details
+    return {
+        "seat": match.get_seat(player),
+        "names": [seat.name for seat in match.seats],
+        "initiative": [match.get_seat(seat) for seat in match.initiative_queue],
+        "private": [card.id for card in player.private_cards],
+        "open": [[card.id for card in seat.open_cards] for seat in match.seats],
+        "private_sizes": [len(seat.private_cards) for seat in match.seats],
+        "hidden_sizes": [len(seat.hidden_cards) for seat in match.seats],
+        "table": [None if card is None else card.id for card in table_cards],
+        "table_size": table_size,
+        "dead_size": len(match.dead_pile),
+    }
+
+
+def diff_view(previous: View, current: View) -> View:
+    """
+    Get the entries of a view that changed, to be sent as a delta.
+
+    Args:
+        previous (View): View last sent to the player.
+        current (View): New view of the player.
+
+    Returns:
+        View: Entries of the current view that are new or different.
+    """
+    return {key: value for key, value in current.items() if previous.get(key) != value}
+
+
+class _Connection:
+    """Stream pair of a client who joined as a player, with the last view sent."""
+    __slots__ = ("reader", "writer", "view")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.view: View = {}
+
+    async def send(self, message: dict[str, Any]) -> None:
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+
+    async def receive(self) -> dict[str, Any]:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Client disconnected")
+        return decode_message(line)
+
+
+class GameServer:
+    """
+    Host of a match played by remote clients, one per player, over JSON lines.
+
+    Clients join with {"type": "join", "name": ...}. Once every player has joined, the
+    match is dealt and each client receives only their own view (see 'build_view') as
+    deltas: {"type": "update", "changes": {...}}. The player with the initiative is asked
+    to play with {"type": "prompt", "moves": [...]} only if they have a choice, and answers
+    with {"type": "play", "move": [rank, count]}. The match ends with
+    {"type": "end", "winner": ...}.
+    """
+
+    def __init__(self, game_mode: GameMode, names: Sequence[str]) -> None:
+        """
+        Args:
+            game_mode (GameMode): Game mode of the match.
+            names (Sequence[str]): Names of the players, see engine.create_director.
+        """
+        self.director: Director = create_director(game_mode, names)
+        self.connections: dict[str, _Connection] = {}
+        self._all_joined = asyncio.Event()
+        self._finished = asyncio.Event()
+
+    async def start(
+            self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+            path: str | None = None) -> asyncio.AbstractServer:
+        """
+        Start listening for clients, on a TCP port or on a Unix socket.
+
+        Args:
+            host (str): Host of the TCP socket. Defaults to DEFAULT_HOST.
+            port (int): Port of the TCP socket, 0 for any free port. Defaults to
+            DEFAULT_PORT.
+            path (str | None): Path of the Unix socket, used instead of TCP if given.
+            Defaults to None.
+
+        Returns:
+            asyncio.AbstractServer: Listening server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(
+            self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Register a client as one of the players, then keep the connection open until
+        the match finishes."""
+        connection = _Connection(reader, writer)
+        try:
+            message = await connection.receive()
+            name = message.get("name")
+            seats = [player.name for player in self.director.match.seats]
+            if message.get("type") != "join" or name not in seats:
+                await connection.send({"type": "error", "reason": "Unknown player"})
+                return
+            if name in self.connections:
+                await connection.send({"type": "error", "reason": "Player already joined"})
+                return
+            self.connections[name] = connection
+            logging.info("Player '%s' joined", name)
+            await connection.send({"type": "joined", "seat": seats.index(name)})
+            if len(self.connections) == len(seats):
+                self._all_joined.set()
+            await self._finished.wait()
+        except (ConnectionError, ValueError) as error:
+            logging.warning("Client dropped: %s", error)
+        finally:
+            writer.close()
+
+    async def _push_views(self, latest_play: list[Card]) -> None:
+        match = self.director.match
+        table_details = self.director.get_table_pile_display(latest_play)
+        sends = []
+        for player in match.seats:
+            connection = self.connections[player.name]
+            view = build_view(match, player, table_details)
+            changes = diff_view(connection.view, view)
+            connection.view = view
+            if changes:
+                sends.append(connection.send({"type": "update", "changes": changes}))
+        await asyncio.gather(*sends)
+
+    async def _ask_for_cards(self, player: Player, moves: list[Move]) -> list[Card]:
+        connection = self.connections[player.name]
+        await connection.send({"type": "prompt", "moves": moves})
+        while True:
+            try:
+                message = await connection.receive()
+                move = tuple(message.get("move") or ())
+            except (ValueError, TypeError) as error:
+                logging.warning("Malformed message from '%s': %s", player.name, error)
+                await connection.send({"type": "error", "reason": "Malformed message"})
+                continue
+            if message.get("type") == "play" and move in moves:
+                return move_to_cards(move, player)
+            await connection.send({"type": "error", "reason": "Invalid move"})
+
+    async def play(self, max_turns: int = MAX_TURNS) -> str | None:
+        """
+        Wait for every player to join, then play the match until it finishes.
+
+        Args:
+            max_turns (int): Amount of turns after which the match is interrupted. Defaults
+            to MAX_TURNS.
+
+        Returns:
+            str | None: Name of the winner, None if the match was interrupted.
+        """
+        await self._all_joined.wait()
+        director = self.director
+        match = director.match
+        match.deal().start()
+        latest_play: list[Card] = []
+        record = None
+        turns = 0
+        try:
+            while match.ended_at is None and turns < max_turns:
+                await self._push_views(latest_play)
+                player = match.initiative_queue.current
+                moves = get_legal_moves(player, match)
+                cards = []
+                if moves != [BLIND] and moves != [PICK_UP]:
+                    cards = await self._ask_for_cards(player, moves)
+                record = director.play_turn(lambda player, match: cards)
+                latest_play = (
+                    [] if record.picked_up or record.pile_killed else list(record.played))
+                turns += 1
+            await self._push_views(latest_play)
+            winner = None
+            if match.ended_at is None:
+                logging.warning("Match interrupted after %d turn(s)", turns)
+                match.finish()
+            else:
+                winner = record.player.name
+            await asyncio.gather(*(
+                connection.send({"type": "end", "winner": winner})
+                for connection in self.connections.values()))
+            return winner
+        finally:
+            self._finished.set()
+
+
+class GameClient:
+    """
+    Thin client of a GameServer: it keeps the view of its player up to date from the
+    deltas and asks a chooser for a move when prompted.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.view: View = {}
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def connect(
+            self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+            path: str | None = None) -> None:
+        """
+        Connect to a server and join the match.
+
+        Args:
+            host (str): Host of the TCP socket. Defaults to DEFAULT_HOST.
+            port (int): Port of the TCP socket. Defaults to DEFAULT_PORT.
+            path (str | None): Path of the Unix socket, used instead of TCP if given.
+            Defaults to None.
+
+        Raises:
+            ConnectionError: If the server refused the player.
+        """
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._writer.write(encode_message({"type": "join", "name": self.name}))
+        await self._writer.drain()
+        message = decode_message(await self._reader.readline() or b"{}")
+        if message.get("type") != "joined":
+            raise ConnectionError(message.get("reason", "Server refused the player"))
+
+    async def run(self, choose: Chooser) -> View:
+        """
+        Play until the match ends.
+
+        Args:
+            choose (Chooser): Decision maker for the prompts, it may be a coroutine.
+
+        Returns:
+            View: Last view of the match, with the name of the winner (key "winner").
+        """
+        try:
+            while line := await self._reader.readline():
+                message = decode_message(line)
+                if message["type"] == "update":
+                    self.view.update(message["changes"])
+                elif message["type"] == "prompt":
+                    moves = [tuple(move) for move in message["moves"]]
+                    move = choose(self.view, moves)
+                    if inspect.isawaitable(move):
+                        move = await move
+                    self._writer.write(encode_message({"type": "play", "move": move}))
+                    await self._writer.drain()
+                elif message["type"] == "end":
+                    self.view["winner"] = message["winner"]
+                    break
+                else:
+                    logging.warning("Server error: %s", message.get("reason"))
+        finally:
+            self._writer.close()
+        return self.view
+
+
+def describe_move(move: Move) -> str:
+    rank, count = move
+    return f"{count}x{CARD_LABELS[rank]}"
+
+
+def render_view(view: View) -> list[str]:
+    """
+    Build the lines of a client screen for a view.
+
+    Args:
+        view (View): View of the player.
+
+    Returns:
+        list[str]: Lines to be drawn.
+    """
+    names = view["names"]
+    lines = [" > ".join(names[seat] for seat in view["initiative"])]
+    table_cards = [
+        None if card_id is None else FULL_DECK[card_id] for card_id in view["table"]]
+    lines.extend(render_table((view["table_size"], table_cards), view["dead_size"]))
+    for seat, name in enumerate(names):
+        open_cards = ", ".join(str(FULL_DECK[card_id]) for card_id in view["open"][seat])
+        lines.append(
+            f"{name:<20} private: {view['private_sizes'][seat]:>2}  "
+            f"hidden: {view['hidden_sizes'][seat]}  open: {open_cards}")
+    private = ", ".join(str(FULL_DECK[card_id]) for card_id in view["private"])
+    lines.append(f"Your cards: {private}")
+    return lines
+
+
+async def prompt_in_terminal(
+        view: View, moves: list[Move], renderer: FrameRenderer) -> Move:
+    """Chooser of the terminal client: draw the view and read the move from the input."""
+    options = "  ".join(
+        f"{number}: {describe_move(move)}" for number, move in enumerate(moves, start=1))
+    renderer.render([*render_view(view), options, "Type the number of your play"])
+    while True:
+        answer = await asyncio.to_thread(input, "> ")
+        if answer.isdigit() and 0 < int(answer) <= len(moves):
+            return moves[int(answer) - 1]
+
+
+async def _serve(args) -> None:
+    game_mode = GameMode.FULL_MONTY if args.mode == "FM" else GameMode.FATAL_THREE_WAY
+    game_server = GameServer(game_mode, args.names)
+    server = await game_server.start(args.host, args.port, args.path)
+    async with server:
+        print(f"Waiting for {', '.join(args.names)}")
+        print(f"Winner: {await game_server.play()}")
+
+
+async def _join(args) -> None:
+    client = GameClient(args.name)
+    await client.connect(args.host, args.port, args.path)
+    renderer = FrameRenderer()
+    view = await client.run(lambda view, moves: prompt_in_terminal(view, moves, renderer))
+    renderer.render([*render_view(view), f"Winner: {view['winner']}"])
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Play a match with one terminal per player")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="host of the TCP socket")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--path", help="path of a Unix socket, used instead of TCP")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="host a match")
+    serve_parser.add_argument("-m", "--mode", choices=("FM", "FTW"), default="FM")
+    serve_parser.add_argument("names", nargs="+", help="names of the players")
+    join_parser = commands.add_parser("join", help="join a match as a player")
+    join_parser.add_argument("name", help="name of the player")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _join(args))
+    except KeyboardInterrupt:
+        print("\rSee ya!")
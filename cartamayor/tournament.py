@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import os
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+from cartamayor.common.types import GameMode
+from cartamayor.director import Policy
+from cartamayor.engine import (
+    MAX_TURNS, MatchResult, create_director, lowest_label_policy, play_match, random_policy)
+
+
+DEFAULT_NAMES = ("North", "East", "South", "West")
+CHUNKS_PER_WORKER = 4
+POLICIES = {"lowest": lowest_label_policy, "random": random_policy}
+
+
+@dataclass
+class TournamentSummary:
+    """
+    Aggregated results of a tournament, computed in match order so it only depends on the
+    seed and the amount of matches (never on the amount of workers).
+
+    Parameters:
+        matches (int): amount of matches played.
+        seed (int): seed from which every match seed was derived.
+        player_wins (Counter[str]): amount of wins of each player.
+        team_wins (Counter[str]): amount of wins of each team (FULL_MONTY only).
+        interrupted (int): amount of matches interrupted before having a winner.
+        total_turns (int): sum of the turns of every match.
+        total_pickups (int): sum of the table pile pickups of every match.
+        total_kills (int): sum of the table pile kills of every match.
+    """
+    matches: int
+    seed: int
+    player_wins: Counter[str] = field(default_factory=Counter)
+    team_wins: Counter[str] = field(default_factory=Counter)
+    interrupted: int = 0
+    total_turns: int = 0
+    total_pickups: int = 0
+    total_kills: int = 0
+
+    def add(self, result: MatchResult) -> TournamentSummary:
+        """Aggregate the result of a match into the summary.
+
+        Args:
+            result (MatchResult): Result of the match.
+
+        Returns:
+            TournamentSummary: self.
+        """
+        if result.winner is None:
+            self.interrupted += 1
+        else:
+            self.player_wins[result.winner] += 1
+        if result.winning_team is not None:
+            self.team_wins[result.winning_team] += 1
+        self.total_turns += result.turns
+        self.total_pickups += result.pickups
+        self.total_kills += result.kills
+        return self
+
+    def __str__(self) -> str:
+        mean_turns = self.total_turns/self.matches if self.matches else 0
+        lines = [
+            f"Matches: {self.matches} (seed {self.seed}), interrupted: {self.interrupted}",
+            f"Mean turns: {mean_turns:.2f}, pickups: {self.total_pickups}, "
+            f"kills: {self.total_kills}"]
+        for name, wins in sorted(self.team_wins.items()):
+            lines.append(f"  {name:<20} {wins:>8} win(s)")
+        for name, wins in sorted(self.player_wins.items()):
+            lines.append(f"  {name:<20} {wins:>8} win(s)")
+        return "\n".join(lines)
+
+
+def match_seed(seed: int, index: int) -> int:
+    """
+    Derive the seed of a single match from the tournament seed and the match index. Every
+    match gets an independent stream, no matter which worker plays it.
+
+    Args:
+        seed (int): Tournament seed.
+        index (int): Index of the match in the tournament.
+
+    Returns:
+        int: 64-bit seed for the match.
+    """
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _play_chunk(
+        seed: int, indexes: range, game_mode: GameMode, policy: Policy,
+        names: Sequence[str], max_turns: int) -> list[MatchResult]:
+    """Play a contiguous chunk of the tournament matches, each with its own seed (no global
+    random state is shared between matches or workers).
+
+    Returns:
+        list[MatchResult]: Results of the matches, in index order.
+    """
+    results = []
+    for index in indexes:
+        director = create_director(game_mode, names, match_seed(seed, index))
+        results.append(play_match(director, policy, max_turns))
+    return results
+
+
+def _split(matches: int, chunks: int) -> Iterable[range]:
+    """Split the match indexes in at most 'chunks' contiguous ranges of similar size."""
+    chunk_size = max(1, math.ceil(matches/chunks))
+    for start in range(0, matches, chunk_size):
+        yield range(start, min(start + chunk_size, matches))
+
+
+def run_tournament(
+        matches: int,
+        seed: int,
+        workers: int | None = None,
+        game_mode: GameMode = GameMode.FULL_MONTY,
+        policy: Policy = lowest_label_policy,
+        names: Sequence[str] = DEFAULT_NAMES,
+        max_turns: int = MAX_TURNS) -> TournamentSummary:
+    """
+    Play a tournament of headless matches spread over a pool of worker processes.
+
+    Workers only send back the compact MatchResult of each match, which are aggregated in
+    match order, so the summary is identical for the same seed regardless of the amount of
+    workers.
+
+    Args:
+        matches (int): Amount of matches to be played.
+        seed (int): Tournament seed, from which each match seed is derived.
+        workers (int | None): Amount of worker processes. If 1, matches are played in the
+        current process. Defaults to None (amount of CPUs).
+        game_mode (GameMode): Game mode of every match. Defaults to FULL_MONTY.
+        policy (Policy): Decision maker for all players, must be picklable (module level
+        function). Defaults to lowest_label_policy.
+        names (Sequence[str]): Names of the players, see engine.create_director.
+        max_turns (int): Amount of turns after which a match is interrupted.
+
+    Returns:
+        TournamentSummary: Aggregated results of all matches.
+    """
+    summary = TournamentSummary(matches, seed)
+    if workers == 1:
+        for result in _play_chunk(
+                seed, range(matches), game_mode, policy, names, max_turns):
+            summary.add(result)
+        return summary
+
+    workers = workers or os.cpu_count() or 1
+    chunks = list(_split(matches, workers*CHUNKS_PER_WORKER))
+    logging.info(
+        "Running %d match(es) in %d chunk(s) over %d worker(s)", matches, len(chunks),
+        workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _play_chunk, seed, chunk, game_mode, policy, names, max_turns)
+            for chunk in chunks]
+        for future in futures:
+            for result in future.result():
+                summary.add(result)
+    return summary
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Play a tournament of headless matches")
+    parser.add_argument("-n", "--matches", type=int, default=1000, help="amount of matches")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="tournament seed")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="amount of worker processes")
+    parser.add_argument(
+        "-p", "--policy", choices=POLICIES, default="lowest", help="policy of all players")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    summary = run_tournament(
+        args.matches, args.seed, args.workers, policy=POLICIES[args.policy])
+    elapsed = time.perf_counter() - start
+    print(summary)
+    print(f"Elapsed: {elapsed:.2f}s ({args.matches/elapsed:.0f} match(es)/s)")
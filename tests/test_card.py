@@ -1,7 +1,11 @@
+import copy
 import math
+import pickle
 from collections import deque
 
-from cartamayor.common.classes import Card
+from cartamayor.common.classes import (
+    FULL_DECK, Card, cards_to_mask, get_card, mask_to_cards)
+from cartamayor.common.constants import PLAYABLE_CARDS_MASK, PLAYABLE_RANKS_MASK
 from cartamayor.common.types import Suit
 
 
@@ -103,3 +107,32 @@ def test_cards_from_diferent_suits() -> None:
     assert Card("10", Suit.CLUBS).power == Card("10", Suit.SPADES).power
     assert Card("A", Suit.CLUBS).resistance == Card("A", Suit.DIAMONDS).resistance
     assert Card("3", Suit.CLUBS).suit == Card("7", Suit.CLUBS).suit
+
+
+def test_playability_table_matches_stats(full_deck: list[Card]) -> None:
+    for card in full_deck:
+        for other in full_deck:
+            assert card.is_playable_on(other) == (card.power >= other.resistance)
+            assert bool(PLAYABLE_RANKS_MASK[other.rank] & 1 << card.rank) == (
+                card.power >= other.resistance)
+            assert bool(PLAYABLE_CARDS_MASK[other.rank] & card.bit) == (
+                card.power >= other.resistance)
+
+
+def test_card_registry(full_deck: list[Card]) -> None:
+    assert [card.id for card in full_deck] == list(range(52))
+    assert all(card is FULL_DECK[card.id] for card in full_deck)
+    assert get_card("Q", Suit.HEARTS) is get_card("Q", Suit.HEARTS)
+    assert get_card("Q", Suit.HEARTS) == Card("Q", Suit.HEARTS)
+    assert hash(get_card("Q", Suit.HEARTS)) == hash(Card("Q", Suit.HEARTS))
+    assert mask_to_cards(cards_to_mask(full_deck)) == full_deck
+
+
+def test_card_copies_are_shared_instances(full_deck: list[Card]) -> None:
+    card = get_card("7", Suit.SPADES)
+    assert copy.copy(card) is card
+    assert copy.deepcopy(card) is card
+    assert pickle.loads(pickle.dumps(card)) is card
+    for copies in (copy.deepcopy(full_deck), pickle.loads(pickle.dumps(full_deck))):
+        assert all(copied is FULL_DECK[copied.id] for copied in copies)
+        assert copies == full_deck
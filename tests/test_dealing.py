@@ -0,0 +1,57 @@
+import pytest
+
+from cartamayor.common.classes import cards_to_mask
+from cartamayor.common.constants import DECK_SIZE
+from cartamayor.common.types import GameMode
+from cartamayor.engine import lowest_label_policy, play_match
+
+np = pytest.importorskip("numpy")
+from cartamayor.dealing import (  # noqa: E402
+    deal_batch, get_bambam_starters, iter_directors, shuffle_decks)
+
+
+NAMES = ("North", "East", "South", "West")
+
+
+def test_shuffle_decks() -> None:
+    decks = shuffle_decks(100, seed=3)
+    assert decks.shape == (100, DECK_SIZE)
+    assert (np.sort(decks, axis=1) == np.arange(DECK_SIZE)).all()
+    assert (decks == shuffle_decks(100, seed=3)).all()
+    assert len({row.tobytes() for row in decks}) == 100
+
+
+@pytest.mark.parametrize("game_mode, seats, dead", [
+    (GameMode.FULL_MONTY, 4, 0), (GameMode.FATAL_THREE_WAY, 3, 1)])
+def test_deal_batch_layout(game_mode, seats, dead) -> None:
+    deal = deal_batch(10, game_mode, seed=5)
+    assert deal.private.shape[:2] == deal.open.shape[:2] == deal.hidden.shape[:2] == (
+        10, seats)
+    assert deal.dead.shape == (10, dead)
+    piles = [deal.private, deal.open, deal.hidden]
+    cards = np.concatenate([pile.reshape(10, -1) for pile in piles] + [deal.dead], axis=1)
+    assert (np.sort(cards, axis=1) == np.arange(DECK_SIZE)).all()
+
+
+def test_iter_directors_match_deal() -> None:
+    deal = deal_batch(3, seed=7)
+    for index, director in enumerate(iter_directors(deal, NAMES, seeds=[1, 2, 3])):
+        match = director.match
+        assert match.seed == index + 1
+        assert [card.id for card in match.deck] == deal.decks[index].tolist()
+        for seat, player in enumerate(match.seats):
+            assert [card.id for card in player.private_cards] == (
+                deal.private[index, seat].tolist())
+            assert [card.id for card in player.hidden_cards] == (
+                deal.hidden[index, seat].tolist())
+            assert player.open_cards.mask == cards_to_mask(player.open_cards)
+        result = play_match(director, lowest_label_policy, deal=False)
+        assert result.winner in NAMES
+
+
+def test_bambam_starters_match_auto_bambam() -> None:
+    deal = deal_batch(200, seed=11)
+    starters = get_bambam_starters(deal)
+    for seat, director in zip(starters.tolist(), iter_directors(deal, NAMES)):
+        match = director.match.start()
+        assert match.get_seat(match.initiative_queue[0]) == seat
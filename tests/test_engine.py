@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from cartamayor.common.classes import Card, Pile, cards_to_mask
+from cartamayor.common.types import GameMode, PileLocation, Suit
+from cartamayor.engine import (
+    create_director, lowest_label_policy, play_match, random_policy, run_matches)
+
+
+NAMES = ("North", "East", "South", "West")
+
+
+def all_cards_mask(director) -> int:
+    match = director.match
+    masks = [match.table_pile.mask, match.dead_pile.mask]
+    for player in match.initiative_queue:
+        masks.extend(
+            [player.private_cards.mask, player.open_cards.mask, player.hidden_cards.mask])
+    assert sum(bin(mask).count("1") for mask in masks) == 52
+    result = 0
+    for mask in masks:
+        result |= mask
+    return result
+
+
+def test_full_match_keeps_every_card() -> None:
+    random.seed(7)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    result = play_match(director, random_policy)
+    assert result.winner in NAMES
+    assert result.winning_team in {"Team 1", "Team 2"}
+    assert director.match.ended_at is not None
+    assert all_cards_mask(director) == (1 << 52) - 1
+
+
+def test_policy_per_player() -> None:
+    random.seed(3)
+    policies = {
+        "North": lowest_label_policy, "East": random_policy,
+        "South": lowest_label_policy, "West": random_policy}
+    result = play_match(create_director(GameMode.FULL_MONTY, NAMES), policies)
+    assert result.turns > 0
+
+
+def test_fatal_three_way_match() -> None:
+    director = create_director(GameMode.FATAL_THREE_WAY, NAMES[:3])
+    result = play_match(director, random_policy)
+    assert result.winner in NAMES[:3]
+    assert result.winning_team is None
+    assert all_cards_mask(director) == (1 << 52) - 1
+
+
+def test_match_is_replayed_from_its_seed() -> None:
+    result = play_match(create_director(GameMode.FULL_MONTY, NAMES), random_policy)
+    replayed = play_match(
+        create_director(GameMode.FULL_MONTY, NAMES, result.seed), random_policy)
+    assert replayed == result
+    other = play_match(
+        create_director(GameMode.FULL_MONTY, NAMES, result.seed + 1), random_policy)
+    assert other.seed == result.seed + 1
+
+
+def test_interrupted_match() -> None:
+    result = play_match(
+        create_director(GameMode.FULL_MONTY, NAMES), lowest_label_policy, max_turns=3)
+    assert result.winner is None
+    assert result.turns == 3
+
+
+def test_run_matches() -> None:
+    results = list(run_matches(5))
+    assert len(results) == 5
+    assert all(result.winner is not None for result in results)
+
+
+def test_invalid_play() -> None:
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    director.match.deal()
+    other = director.match.initiative_queue[1]
+    with pytest.raises(ValueError):
+        director.play_turn(lambda *_: [])
+    with pytest.raises(ValueError):
+        director.play_turn(lambda *_: [other.private_cards[0]])
+
+
+def test_kill_and_pickup() -> None:
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    match = director.match
+    player = match.initiative_queue[0]
+    player.private_cards.extend([Card("7", Suit.CLUBS), Card("3", Suit.CLUBS)])
+    player.hidden_cards.append(Card("4", Suit.CLUBS))
+    match.table_pile.extend([
+        Card("7", Suit.DIAMONDS), Card("7", Suit.HEARTS), Card("7", Suit.SPADES)])
+
+    record = director.play_turn(lambda *_: [Card("7", Suit.CLUBS)])
+    assert record.pile_killed
+    assert not match.table_pile
+    assert len(match.dead_pile) == 4
+    assert match.initiative_queue[0] is player
+
+    match.table_pile.append(Card("A", Suit.CLUBS))
+    record = director.play_turn(lambda *_: pytest.fail("No choice to be made"))
+    assert record.picked_up == 1
+    assert cards_to_mask(player.private_cards) == cards_to_mask([
+        Card("3", Suit.CLUBS), Card("A", Suit.CLUBS)])
+    assert Pile(PileLocation.TABLE) == match.table_pile
+    assert match.initiative_queue[0] is not player
@@ -0,0 +1,41 @@
+from collections import deque
+
+import pytest
+
+from cartamayor.common.classes import Initiative, Player
+
+
+@pytest.mark.parametrize("amount", [3, 4])
+def test_initiative_follows_deque_rotation(amount: int) -> None:
+    players = [Player(f"Player {seat}") for seat in range(amount)]
+    initiative = Initiative(players)
+    queue = deque(players)
+    for step in range(3*amount):
+        if step % 4 == 3:
+            # Previous implementation of a change of direction
+            queue.rotate(-1)
+            queue.reverse()
+            initiative.reverse()
+        else:
+            queue.rotate(-1)
+            initiative.advance()
+        assert list(initiative) == list(queue)
+        assert [initiative[index] for index in range(amount)] == list(queue)
+        assert initiative[-1] is queue[-1]
+        assert initiative.current is queue[0]
+        assert initiative.get_seat(1) == players.index(queue[1])
+
+
+def test_initiative_lookahead_and_order() -> None:
+    players = [Player("A"), Player("B"), Player("C")]
+    initiative = Initiative(players)
+    assert initiative.get_next(4) is players[1]
+    with pytest.raises(IndexError):
+        initiative[3]
+    initiative.set_order([2, 1, 0])
+    assert (initiative.head, initiative.direction) == (2, -1)
+    assert list(initiative) == players[::-1]
+    assert players[0] in initiative
+    other = Initiative(players).set_order([2, 0, 1])
+    assert other != initiative
+    assert other == Initiative(players).advance(2)
@@ -1,6 +1,9 @@
+import os
 import pytest
+import signal
 
 from collections import deque
+from io import StringIO
 from datetime import datetime
 
 from cartamayor.common.classes import Player, Card
@@ -12,12 +15,16 @@ from cartamayor.interface import (
     prompt_for_game_mode,
     prompt_for_FM_teams,
     prompt_for_FTW_players,
+    prompt_for_handover,
     show_player_state,
     show_table,
     welcome_users,
     show_match_status,
     trim_long_string,
     detailed_player_state,
+    FrameRenderer,
+    render_table,
+    TerminalSession,
     )
 
 
@@ -313,3 +320,122 @@ def test_detailed_player_state(capsys, test_input, expected) -> None:
     detailed_player_state(test_input)
     captured = capsys.readouterr()
     assert captured.out == expected
+
+
+def test_render_table_single_card() -> None:
+    assert render_table((1, [None]), 0) == [
+        "┌────────────────────────────┐",
+        "│       TABLE (=1): ▇        │",
+        "│         └         ▇        │",
+        "└────────────────────────────┘",
+        "           DEAD (=0)"]
+
+
+def test_render_table_empty() -> None:
+    assert render_table((0, []), 0) == [
+        "┌────────────────────────────┐",
+        "│       TABLE (=0):          │",
+        "└────────────────────────────┘",
+        "           DEAD (=0)"]
+
+
+def test_frame_renderer_first_frame() -> None:
+    stream = StringIO()
+    renderer = FrameRenderer(stream)
+    written = renderer.render(["first", "second"])
+    assert stream.getvalue() == (
+        "\x1b[H\x1b[2J"
+        "\x1b[1;1Hfirst\x1b[K"
+        "\x1b[2;1Hsecond\x1b[K"
+        "\x1b[3;1H\x1b[J")
+    assert written == len(stream.getvalue())
+
+
+def test_frame_renderer_only_writes_changes() -> None:
+    stream = StringIO()
+    renderer = FrameRenderer(stream)
+    renderer.render(["first", "second", "third"])
+    stream.seek(0)
+    stream.truncate()
+    renderer.render(["first", "SECOND"])
+    assert stream.getvalue() == "\x1b[2;1HSECOND\x1b[K\x1b[3;1H\x1b[J"
+    stream.seek(0)
+    stream.truncate()
+    renderer.render(["first", "SECOND"])
+    assert stream.getvalue() == "\x1b[3;1H\x1b[J"
+
+
+def test_frame_renderer_invalidate() -> None:
+    stream = StringIO()
+    renderer = FrameRenderer(stream)
+    renderer.render(["first"])
+    renderer.invalidate()
+    assert renderer.diff(["first"]) == "\x1b[H\x1b[2J\x1b[1;1Hfirst\x1b[K\x1b[2;1H\x1b[J"
+
+
+def test_terminal_session_caches_size(monkeypatch) -> None:
+    calls = []
+
+    def get_terminal_size(fd):
+        calls.append(fd)
+        return os.terminal_size((120, 40))
+
+    monkeypatch.setattr("os.get_terminal_size", get_terminal_size)
+    stream = StringIO()
+    stream.fileno = lambda: 1
+    terminal = TerminalSession(stream)
+    assert (terminal.columns, terminal.lines) == (120, 40)
+    assert terminal.size == (120, 40)
+    assert len(calls) == 1
+    terminal._on_resize(None, None)
+    assert terminal.lines == 40
+    assert len(calls) == 2
+
+
+def test_terminal_session_not_a_terminal() -> None:
+    terminal = TerminalSession(StringIO())
+    assert terminal.size == TerminalSession.DEFAULT_SIZE
+
+
+def test_terminal_session_context() -> None:
+    stream = StringIO()
+    with TerminalSession(stream, alternate_screen=True) as terminal:
+        terminal.renderer.render(["frame"])
+        if hasattr(signal, "SIGWINCH"):
+            assert signal.getsignal(signal.SIGWINCH) == terminal._on_resize
+    if hasattr(signal, "SIGWINCH"):
+        assert signal.getsignal(signal.SIGWINCH) != terminal._on_resize
+    assert stream.getvalue() == (
+        "\x1b[?1049h\x1b[H\x1b[2J"
+        "\x1b[1;1Hframe\x1b[K\x1b[2;1H\x1b[J"
+        "\x1b[?1049l")
+
+
+def test_terminal_session_render_and_clear() -> None:
+    stream = StringIO()
+    terminal = TerminalSession(stream)
+    terminal.render(["x"*100, "short"])
+    assert "x"*80 + "\x1b[K" in stream.getvalue()
+    assert "x"*81 not in stream.getvalue()
+    stream.seek(0)
+    stream.truncate()
+    clear_viewport(session=terminal)
+    assert stream.getvalue() == "\x1b[H\x1b[2J"
+    terminal.render(["x"*100, "short"])
+    assert "short" in stream.getvalue()
+
+
+def test_prompt_for_handover(monkeypatch, capsys) -> None:
+    stream = StringIO()
+    terminal = TerminalSession(stream)
+    terminal.render(["North's cards"])
+    stream.seek(0)
+    stream.truncate()
+    prompts = []
+    monkeypatch.setattr("builtins.input", lambda prompt: prompts.append(prompt) or "")
+    prompt_for_handover(Player("East"), terminal)
+    assert stream.getvalue() == "\x1b[H\x1b[2J"
+    assert prompts == ['Pass the terminal to East, then hit "Enter" ']
+    terminal.render(["East's cards"])
+    assert stream.getvalue().endswith(
+        "\x1b[H\x1b[2J\x1b[1;1HEast's cards\x1b[K\x1b[2;1H\x1b[J")
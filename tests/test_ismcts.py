@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from cartamayor.common.classes import cards_to_mask
+from cartamayor.common.types import GameMode
+from cartamayor.engine import create_director, play_match, random_policy
+from cartamayor.ismcts import BLIND, PICK_UP, ISMCTSPlayer, RolloutState, _ranks_histogram
+
+
+NAMES = ("North", "East", "South", "West")
+
+
+def full_state(match) -> RolloutState:
+    top_label, top_run = match.table_pile.get_run()
+    return RolloutState(
+        [_ranks_histogram(player.private_cards.mask) for player in match.seats],
+        [_ranks_histogram(player.open_cards.mask) for player in match.seats],
+        [[card.rank for card in player.hidden_cards] for player in match.seats],
+        list(match.table_pile.rank_counts),
+        match.table_pile[-1].rank if match.table_pile else -1, top_run,
+        [match.get_seat(player) for player in match.initiative_queue])
+
+
+def test_rollout_state_follows_director_rules() -> None:
+    random.seed(31)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    match = director.match
+    match.deal().start()
+    state = full_state(match)
+    while match.ended_at is None:
+        record = director.play_turn(random_policy)
+        if record.played and not record.source.name == "HIDDEN":
+            move = (record.played[0].rank, len(record.played))
+        elif record.played:
+            move = BLIND
+        else:
+            move = PICK_UP
+        assert move in state.legal_moves()
+        state.apply(move)
+        expected = full_state(match)
+        assert state.private == expected.private
+        assert state.open == expected.open
+        assert state.hidden == expected.hidden
+        assert (state.table, state.top_rank, state.top_run) == (
+            expected.table, expected.top_rank, expected.top_run)
+        if match.ended_at is None:
+            assert state.seat == expected.seat
+    assert state.winner == match.get_seat(record.player)
+
+
+def test_determinize_is_consistent() -> None:
+    random.seed(37)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    match = director.match
+    match.deal().start()
+    bot = ISMCTSPlayer(time_limit=None, iterations=1, seed=0)
+    for _ in range(12):
+        bot.observe(director.play_turn(random_policy), match)
+    seat = match.get_seat(match.initiative_queue[0])
+    state = bot.determinize(match, seat, bot._build_state(match, seat))
+    expected = full_state(match)
+    assert state.private[seat] == expected.private[seat]
+    assert state.open == expected.open
+    for other, player in enumerate(match.seats):
+        assert sum(state.private[other]) == len(player.private_cards)
+        assert len(state.hidden[other]) == len(player.hidden_cards)
+        known = _ranks_histogram(bot._known[other])
+        assert all(a >= b for a, b in zip(state.private[other], known))
+        assert not bot._known[other] & ~player.private_cards.mask
+    rank_totals = [
+        sum(counts) for counts in zip(
+            *state.private, *state.open, match.table_pile.rank_counts,
+            match.dead_pile.rank_counts)]
+    for ranks in state.hidden:
+        for rank in ranks:
+            rank_totals[rank] += 1
+    assert sum(rank_totals) == 52
+    assert set(rank_totals) == {4}
+
+
+def test_bot_plays_legal_cards() -> None:
+    random.seed(41)
+    bot = ISMCTSPlayer(time_limit=None, iterations=30, seed=1)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    result = play_match(director, bot)
+    assert result.winner is not None
+
+
+def test_bot_is_deterministic_with_iterations() -> None:
+    def choose():
+        random.seed(43)
+        director = create_director(GameMode.FULL_MONTY, NAMES)
+        director.match.deal().start()
+        bot = ISMCTSPlayer(time_limit=None, iterations=100, seed=2)
+        player = director.match.initiative_queue[0]
+        return cards_to_mask(bot(player, director.match))
+
+    assert choose() == choose()
+
+
+def test_bot_beats_random_policy() -> None:
+    bot = ISMCTSPlayer(time_limit=None, iterations=60, seed=3)
+    wins = 0
+    for seed in range(4):
+        random.seed(seed)
+        result = play_match(
+            create_director(GameMode.FULL_MONTY, NAMES),
+            {"North": bot, "East": bot, "South": random_policy, "West": random_policy})
+        wins += result.winning_team == "Team 1"
+    assert wins >= 3
+
+
+def test_bot_requires_budget() -> None:
+    with pytest.raises(ValueError):
+        ISMCTSPlayer(time_limit=None, iterations=None)
+
+
+def test_bot_plays_without_time_budget() -> None:
+    random.seed(47)
+    bot = ISMCTSPlayer(time_limit=0.0, seed=4)
+    result = play_match(create_director(GameMode.FULL_MONTY, NAMES), bot)
+    assert result.winner is not None
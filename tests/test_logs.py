@@ -0,0 +1,64 @@
+import logging
+import os
+
+import pytest
+
+from cartamayor.logs import configured_logging, load_compiled_config, load_config
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET) -> None:
+        super().__init__(level)
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(self.format(record))
+
+
+def test_queued_logging() -> None:
+    config = {
+        "version": 1,
+        "handlers": {"memory": {"()": RecordingHandler, "level": "INFO"}},
+        "root": {"handlers": ["memory"], "level": "DEBUG"}}
+    with configured_logging(config) as listener:
+        root = logging.getLogger()
+        handler = listener.handlers[0]
+        assert root.handlers != [handler]
+        cards = ["♢4", "♠7"]
+        logging.info("Played %s", cards)
+        cards.append("♣2")
+        logging.debug("Not handled")
+    assert handler.messages == ["Played ['♢4', '♠7']"]
+    assert root.handlers == [handler]
+
+
+def test_sync_logging() -> None:
+    config = {
+        "version": 1,
+        "handlers": {"memory": {"()": RecordingHandler}},
+        "root": {"handlers": ["memory"], "level": "DEBUG"}}
+    with configured_logging(config, queued=False) as listener:
+        assert listener is None
+        handler = logging.getLogger().handlers[0]
+        logging.debug("Handled %d", 1)
+        assert handler.messages == ["Handled 1"]
+
+
+def test_compiled_config(tmp_path) -> None:
+    path = tmp_path / "logging.json"
+    compiled_path = tmp_path / "__pycache__" / "logging.json.marshal"
+    path.write_text('{"version": 1, "root": {"level": "INFO"}}')
+    assert load_compiled_config(str(path), str(compiled_path)) == load_config(str(path))
+    assert compiled_path.exists()
+    path.write_text('{"version": 1, "root": {"level": "DEBUG"}}')
+    os.utime(compiled_path, ns=(0, 0))
+    assert load_compiled_config(str(path), str(compiled_path))["root"]["level"] == "DEBUG"
@@ -1,8 +1,12 @@
+import copy
+import pickle
+import random
 from collections import deque
 from datetime import datetime
 
-from cartamayor.common.classes import Card, Player, Pile
+from cartamayor.common.classes import Card, Player, Pile, get_card
 from cartamayor.common.types import GameMode, PileLocation, Suit
+from cartamayor.engine import create_director, random_policy
 from cartamayor.match import Match
 
 
@@ -38,3 +42,118 @@ def test_match_print(
     assert str(not_started) == (
         "FULL MONTY not started - "
         "[Player One, Player 2, Third Player, 4th Player] - Top table card: ♠5 - # Dead: 0")
+
+
+def dealt_match() -> Match:
+    random.seed(23)
+    director = create_director(GameMode.FULL_MONTY, ("North", "East", "South", "West"))
+    director.match.deal().start()
+    for _ in range(10):
+        director.play_turn(random_policy)
+    return director.match
+
+
+def test_match_snapshot_restore() -> None:
+    match = dealt_match()
+    state = match.snapshot()
+    piles = [list(pile) for pile in match.get_piles()]
+    queue = list(match.initiative_queue)
+    match.seats[0].private_cards.clear()
+    match.table_pile.extend(match.dead_pile)
+    match.initiative_queue.advance().reverse()
+    match.finish()
+    match.restore(state)
+    assert [list(pile) for pile in match.get_piles()] == piles
+    assert all(a is b for a, b in zip(match.initiative_queue, queue))
+    assert match.ended_at is None
+    assert match.snapshot() == state
+    assert match.table_pile.mask == sum(card.bit for card in match.table_pile)
+
+
+def test_match_clone() -> None:
+    match = dealt_match()
+    clone = match.clone()
+    assert clone.snapshot() == match.snapshot()
+    assert [player.name for player in clone.initiative_queue] == [
+        player.name for player in match.initiative_queue]
+    clone.initiative_queue[0].private_cards.clear()
+    clone.table_pile.clear()
+    assert match.initiative_queue[0].private_cards
+    assert clone.snapshot() != match.snapshot()
+
+
+def test_match_zobrist_hash() -> None:
+    random.seed(29)
+    director = create_director(GameMode.FULL_MONTY, ("North", "East", "South", "West"))
+    match = director.match
+    match.deal().start()
+    hashes = {match.zobrist_hash}
+    for _ in range(30):
+        state, zobrist_hash = match.snapshot(), match.zobrist_hash
+        director.play_turn(random_policy)
+        if match.ended_at is not None:
+            break
+        hashes.add(match.zobrist_hash)
+        rebuilt = Match(
+            match.game_mode, deque(match.seats), match.deck, match.table_pile,
+            match.dead_pile)
+        rebuilt.initiative_queue.set_order(
+            [match.get_seat(player) for player in match.initiative_queue])
+        assert rebuilt.zobrist_hash == match.zobrist_hash
+        assert match.clone().zobrist_hash == match.zobrist_hash
+        assert copy.deepcopy(match).zobrist_hash == match.zobrist_hash
+        assert pickle.loads(pickle.dumps(match)).zobrist_hash == match.zobrist_hash
+        match.restore(state)
+        assert match.zobrist_hash == zobrist_hash
+        director.play_turn(random_policy)
+    assert len(hashes) > 20
+    assert all(0 <= value < 2**64 for value in hashes)
+
+
+def test_match_zobrist_hash_direction() -> None:
+    match = dealt_match()
+    zobrist_hash = match.zobrist_hash
+    head = match.initiative_queue[0]
+    match.initiative_queue.reverse()
+    assert match.initiative_queue[0] is head
+    assert match.zobrist_hash != zobrist_hash
+
+
+def test_match_seed() -> None:
+    decks = []
+    for _ in range(2):
+        director = create_director(
+            GameMode.FULL_MONTY, ("North", "East", "South", "West"), seed=5)
+        decks.append(list(director.match.deal().deck))
+    assert director.match.seed == 5
+    assert decks[0] == decks[1]
+    clone = director.match.clone()
+    assert clone.seed == 5
+    assert clone.rng.random() == director.match.rng.random()
+
+
+def test_auto_bambam() -> None:
+    hands = {
+        "North": [("5", Suit.HEARTS), ("9", Suit.SPADES)],
+        "East": [("3", Suit.CLUBS), ("A", Suit.SPADES)],
+        "South": [("3", Suit.HEARTS), ("3", Suit.SPADES)],
+        "West": [("4", Suit.CLUBS)]}
+    match = create_director(GameMode.FULL_MONTY, ("North", "East", "South", "West")).match
+    players = {player.name: player for player in match.seats}
+    for name, hand in hands.items():
+        players[name].private_cards.extend(get_card(*card) for card in hand)
+    seat_order = [player.name for player in match.seats]
+    match.start()
+    # South holds two 3s, East only one: the order of play is kept from South
+    head = seat_order.index("South")
+    assert [player.name for player in match.initiative_queue] == (
+        seat_order[head:] + seat_order[:head])
+    players["East"].private_cards.append(get_card("3", Suit.DIAMONDS))
+    players["East"].private_cards.append(get_card("2", Suit.DIAMONDS))
+    assert match.auto_bambam().initiative_queue[0].name == "South"
+    players["East"].private_cards.pop()
+    players["South"].private_cards.pop()
+    assert match.auto_bambam().initiative_queue[0].name == "East"
+    players["East"].private_cards.pop()
+    # Tied on a single 3, the first in the queue starts
+    assert match.auto_bambam().initiative_queue[0].name == "East"
@@ -0,0 +1,55 @@
+import random
+
+from cartamayor.common.classes import Pile, Player, get_card
+from cartamayor.common.constants import CARD_LABELS
+from cartamayor.common.types import GameMode, PileLocation, Suit
+from cartamayor.engine import create_director, random_policy
+from cartamayor.moves import (
+    BLIND, PICK_UP, generate_moves, get_legal_moves, move_to_cards)
+
+
+def test_generate_moves_order() -> None:
+    counts = [0]*len(CARD_LABELS)
+    counts[CARD_LABELS.index("2")] = 1
+    counts[CARD_LABELS.index("K")] = 2
+    counts[CARD_LABELS.index("4")] = 1
+    two, four, king = (CARD_LABELS.index(label) for label in ("2", "4", "K"))
+    assert generate_moves(counts, -1) == [(four, 1), (king, 1), (king, 2), (two, 1)]
+    assert generate_moves(counts, CARD_LABELS.index("Q")) == [
+        (king, 1), (king, 2), (two, 1)]
+    counts[two] = 0
+    assert generate_moves(counts, CARD_LABELS.index("A")) == [PICK_UP]
+    assert generate_moves(None, CARD_LABELS.index("A")) == [BLIND]
+
+
+def test_legal_moves_match_playable_cards() -> None:
+    random.seed(47)
+    director = create_director(GameMode.FULL_MONTY, ("North", "East", "South", "West"))
+    match = director.match
+    match.deal().start()
+    while match.ended_at is None:
+        player = match.initiative_queue[0]
+        moves = get_legal_moves(player, match)
+        source = player.get_source()
+        if source.location == PileLocation.HIDDEN:
+            assert moves == [BLIND]
+        else:
+            playable = player.get_playable_cards(match.table_pile)
+            expected = {
+                (card.rank, count)
+                for card in playable
+                for count in range(1, 1 + sum(c.rank == card.rank for c in playable))}
+            assert set(moves) == (expected or {PICK_UP})
+            assert len(moves) == len(set(moves))
+            for move in moves:
+                if move != PICK_UP:
+                    cards = move_to_cards(move, player)
+                    assert len(cards) == move[1]
+                    assert all(card.rank == move[0] and card in source for card in cards)
+        director.play_turn(random_policy)
+
+
+def test_move_to_cards_blind() -> None:
+    hidden = [get_card("3", Suit.CLUBS), get_card("9", Suit.HEARTS)]
+    player = Player("Test", hidden_cards=Pile(PileLocation.HIDDEN, hidden))
+    assert move_to_cards(BLIND, player) == [get_card("9", Suit.HEARTS)]
@@ -1,4 +1,10 @@
-from cartamayor.common.classes import Card, Pile
+import copy
+import math
+import pickle
+
+import pytest
+
+from cartamayor.common.classes import Card, Pile, cards_to_mask
 from cartamayor.common.types import PileLocation, Suit
 
 
@@ -107,3 +113,104 @@ def test_add_cards_to_sorted_pile() -> None:
         Card("A", Suit.SPADES),
     ])
     assert str(p) == "(PRIVATE) Pile[♢3, ♣4, ♠A, ♡10, ♠2]"
+
+
+def test_pile_card_set(private_pile: Pile, open_pile: Pile) -> None:
+    assert Card("A", Suit.SPADES) in private_pile
+    assert Card("A", Suit.HEARTS) not in private_pile
+    assert private_pile.mask == cards_to_mask(private_pile)
+    assert private_pile.mask & open_pile.mask == 0
+
+    private_pile.pop()
+    assert Card("4", Suit.CLUBS) not in private_pile
+    open_pile.appendleft(Card("4", Suit.CLUBS))
+    assert Card("4", Suit.CLUBS) in open_pile
+    open_pile.clear()
+    assert open_pile.mask == 0
+
+
+def test_playable_mask(private_pile: Pile, table_pile: Pile) -> None:
+    assert private_pile.get_playable_mask(table_pile) == cards_to_mask([
+        Card("2", Suit.CLUBS), Card("10", Suit.HEARTS), Card("A", Suit.SPADES)])
+    assert private_pile.get_playable_mask(Pile(PileLocation.TABLE)) == private_pile.mask
+
+
+def test_failed_card_removal_keeps_pile(private_pile: Pile) -> None:
+    with pytest.raises(ValueError):
+        private_pile.remove_cards([Card("2", Suit.CLUBS), Card("K", Suit.CLUBS)])
+    assert len(private_pile) == 5
+    assert Card("2", Suit.CLUBS) in private_pile
+
+
+def test_add_cards_to_sorted_pile_keeps_power_order() -> None:
+    p = Pile(
+        PileLocation.PRIVATE, [Card("K", Suit.HEARTS), Card("3", Suit.CLUBS)], sorted=True)
+    p.add_cards([Card("5", Suit.DIAMONDS), Card("4", Suit.SPADES), Card("3", Suit.HEARTS)])
+    assert str(p) == "(PRIVATE) Pile[♣3, ♡3, ♠4, ♢5, ♡K]"
+
+    p.add_cards([Card("10", Suit.CLUBS), Card("2", Suit.CLUBS), Card("A", Suit.CLUBS)])
+    assert str(p) == "(PRIVATE) Pile[♣3, ♡3, ♠4, ♢5, ♡K, ♣A, ♣10, ♣2]"
+
+
+def test_pile_aggregates(open_pile: Pile, table_pile: Pile) -> None:
+    assert open_pile.max_power == 7
+    assert open_pile.rank_counts[Card("5", Suit.CLUBS).rank] == 1
+    open_pile.pop()
+    assert open_pile.max_power == 6
+    open_pile.add_cards([Card("2", Suit.CLUBS)])
+    assert open_pile.max_power == math.inf
+    open_pile.remove_cards([Card("2", Suit.CLUBS), Card("4", Suit.DIAMONDS)])
+    assert open_pile.max_power == 6
+    assert open_pile.rank_counts[Card("4", Suit.CLUBS).rank] == 0
+
+    empty_pile = Pile(PileLocation.OPEN)
+    assert empty_pile.max_power == -math.inf
+    assert not empty_pile.contains_playable_card(table_pile)
+
+
+def test_pile_runs(table_pile: Pile) -> None:
+    assert table_pile.get_run() == ("5", 1)
+    table_pile.extend([Card("5", Suit.CLUBS), Card("5", Suit.HEARTS)])
+    assert table_pile.get_run() == ("5", 3)
+    assert table_pile.get_run(1) == ("10", 1)
+    table_pile.append(Card("5", Suit.DIAMONDS))
+    assert table_pile.top_run_length == 4
+
+    table_pile.pop()
+    table_pile.pop()
+    assert table_pile.get_run() == ("5", 2)
+    table_pile.remove(Card("5", Suit.CLUBS))
+    table_pile.popleft()
+    assert table_pile.get_run() == ("5", 1)
+    assert table_pile.get_run(5) == ("4", 1)
+    assert table_pile.get_run(6) == (None, 0)
+
+    table_pile.clear()
+    assert table_pile.top_run_length == 0
+    table_pile.append(Card("2", Suit.CLUBS))
+    assert table_pile.get_run() == ("2", 1)
+
+
+def test_pile_top_view(table_pile: Pile) -> None:
+    assert list(table_pile.top(2)) == [Card("5", Suit.SPADES), Card("10", Suit.DIAMONDS)]
+    assert len(list(table_pile.top(20))) == 7
+    assert list(Pile(PileLocation.TABLE).top(3)) == []
+
+
+def test_pile_copy(table_pile: Pile) -> None:
+    pile_copy = copy.copy(table_pile)
+    assert pile_copy == table_pile
+    assert pile_copy.mask == table_pile.mask
+    assert pile_copy.get_run() == table_pile.get_run()
+    pile_copy.pop()
+    assert len(pile_copy) == len(table_pile) - 1
+    assert pile_copy.mask != table_pile.mask
+    assert pickle.loads(pickle.dumps(table_pile)) == table_pile
+    assert copy.deepcopy(table_pile) == table_pile
+
+
+def test_pile_reset(private_pile: Pile, table_pile: Pile) -> None:
+    private_pile.reset(reversed(table_pile))
+    assert list(private_pile) == list(reversed(table_pile))
+    assert private_pile.mask == table_pile.mask
+    assert private_pile.rank_counts == table_pile.rank_counts
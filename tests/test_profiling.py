@@ -0,0 +1,42 @@
+import random
+
+from cartamayor.common.types import GameMode
+from cartamayor.engine import create_director, lowest_label_policy, play_match
+from cartamayor.profiling import PhaseProfile, get_percentile, profiling_phases, timed
+
+
+@timed("double")
+def double(value: int) -> int:
+    return value*2
+
+
+def test_get_percentile() -> None:
+    values = list(range(1, 101))
+    assert get_percentile(values, 0.5) == 50
+    assert get_percentile(values, 0.99) == 99
+    assert get_percentile([7], 0.99) == 7
+    assert get_percentile([], 0.5) == 0
+
+
+def test_timed_records_only_while_profiling() -> None:
+    assert double(2) == 4
+    with profiling_phases() as profile:
+        assert double(3) == 6
+        assert double(4) == 8
+    assert double(5) == 10
+    assert len(profile.durations["double"]) == 2
+    summary, = profile.summarize()
+    assert summary.phase == "double" and summary.count == 2
+    assert summary.p50 <= summary.p99 <= summary.total
+
+
+def test_match_phases() -> None:
+    random.seed(21)
+    director = create_director(GameMode.FULL_MONTY, ("North", "East", "South", "West"))
+    with profiling_phases(PhaseProfile()) as profile:
+        result = play_match(director, lowest_label_policy)
+    counts = {summary.phase: summary.count for summary in profile.summarize()}
+    assert counts["Match.deal"] == counts["Match.start"] == counts["Match.auto_bambam"] == 1
+    assert counts["Director.play_turn"] == result.turns
+    lines = profile.render()
+    assert len(lines) == len(counts) + 1
@@ -0,0 +1,85 @@
+import random
+from io import BytesIO
+
+import pytest
+
+from cartamayor.common.types import GameMode
+from cartamayor.engine import create_director, play_match, random_policy
+from cartamayor.replay import EventKind, EventLog, MatchReplay, RECORD
+
+
+NAMES = ("North", "East", "South", "West")
+
+
+def record_match(seed: int, snapshot_interval: int, close: bool = True):
+    random.seed(seed)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    match = director.match
+    match.deal().start()
+    stream = BytesIO()
+    event_log = EventLog(stream, snapshot_interval)
+    event_log.start(match)
+    states = [match.snapshot()]
+    while match.ended_at is None:
+        event_log.record_turn(director.play_turn(random_policy), match)
+        states.append(match.snapshot())
+    if close:
+        event_log.close()
+    return stream.getvalue(), states
+
+
+def test_state_at_every_turn() -> None:
+    data, states = record_match(seed=3, snapshot_interval=5)
+    replay = MatchReplay(data)
+    assert sorted(replay.names) == sorted(NAMES)
+    assert replay.game_mode == GameMode.FULL_MONTY
+    assert replay.turns == len(states) - 1
+    for turn in range(replay.turns + 1):
+        assert replay.state_at(turn).snapshot() == states[turn]
+    assert replay.state_at(replay.turns).ended_at is not None
+    with pytest.raises(ValueError):
+        replay.state_at(replay.turns + 1)
+
+
+def test_unclosed_log_is_replayed_from_start() -> None:
+    data, states = record_match(seed=5, snapshot_interval=5, close=False)
+    replay = MatchReplay(data + b"\x01\x02")
+    assert replay.turns == len(states) - 1
+    assert replay.state_at(replay.turns).snapshot() == states[-1]
+
+
+def test_events() -> None:
+    data, states = record_match(seed=11, snapshot_interval=1000)
+    replay = MatchReplay(data)
+    events = list(replay.events())
+    assert len(events) == replay.records
+    assert all(0 < event.count <= 4 for event in events if event.kind == EventKind.PLAY)
+    assert events[-1].kind == EventKind.FINISH
+    assert sum(event.kind == EventKind.INITIATIVE for event in events) == replay.turns - 1
+    assert len(data) > replay.records*RECORD.size
+
+
+def test_build_match() -> None:
+    data, states = record_match(seed=13, snapshot_interval=5)
+    match = MatchReplay(data).build_match()
+    assert match.snapshot() == states[0]
+    match.restore(states[len(states)//2])
+    assert match.snapshot() == states[len(states)//2]
+
+
+def test_play_match_event_log() -> None:
+    random.seed(17)
+    stream = BytesIO()
+    with EventLog(stream) as event_log:
+        result = play_match(
+            create_director(GameMode.FULL_MONTY, NAMES), random_policy,
+            event_log=event_log)
+    replay = MatchReplay(stream.getvalue())
+    assert replay.turns == result.turns
+    last_event = list(replay.events())[-1]
+    assert replay.names[last_event.seat] == result.winner
+
+
+def test_invalid_log() -> None:
+    with pytest.raises(ValueError):
+        MatchReplay(b"NOPE" + bytes(64))
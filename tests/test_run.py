@@ -0,0 +1,8 @@
+from cartamayor.run import profile_startup
+
+
+def test_profile_startup() -> None:
+    lines = profile_startup(top=5)
+    assert lines[0].startswith("Startup imports:")
+    assert any(line.startswith("cartamayor.run ") for line in lines)
+    assert lines[-6].startswith("Slowest modules")
@@ -0,0 +1,131 @@
+import asyncio
+import random
+
+from cartamayor.common.types import GameMode
+from cartamayor.engine import create_director
+from cartamayor.server import (
+    GameClient, GameServer, build_view, decode_message, diff_view, encode_message,
+    render_view)
+
+
+NAMES = ("North", "East", "South", "West")
+
+
+async def _play_remote_match() -> tuple[str | None, dict[str, dict], dict[str, list]]:
+    game_server = GameServer(GameMode.FULL_MONTY, NAMES)
+    server = await game_server.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    seen_private: dict[str, list] = {name: [] for name in NAMES}
+
+    def choose_first(name):
+        def choose(view, moves):
+            seen_private[name].append(list(view["private"]))
+            return moves[0]
+        return choose
+
+    async with server:
+        clients = [GameClient(name) for name in NAMES]
+        for client in clients:
+            await client.connect(port=port)
+        winner, *views = await asyncio.gather(
+            game_server.play(),
+            *(client.run(choose_first(client.name)) for client in clients))
+    return winner, dict(zip(NAMES, views)), seen_private
+
+
+def test_remote_match_is_played_to_the_end() -> None:
+    random.seed(19)
+    winner, views, seen_private = asyncio.run(_play_remote_match())
+    assert winner in NAMES
+    for name, view in views.items():
+        assert view["winner"] == winner
+        assert view["names"][view["seat"]] == name
+        assert any(seen_private[name])
+    seat = views[winner]["seat"]
+    assert views[winner]["private_sizes"][seat] == 0
+    assert views[winner]["hidden_sizes"][seat] == 0
+    assert render_view(views[winner])
+
+
+def test_views_only_hold_own_private_cards() -> None:
+    random.seed(23)
+    director = create_director(GameMode.FULL_MONTY, NAMES)
+    match = director.match
+    match.deal().start()
+    table_details = director.get_table_pile_display([])
+    for player in match.seats:
+        view = build_view(match, player, table_details)
+        assert view["private"] == [card.id for card in player.private_cards]
+        assert view["names"][view["seat"]] == player.name
+        shown = set(view["private"]).union(
+            *view["open"], (card_id for card_id in view["table"] if card_id is not None))
+        for other in match.seats:
+            if other is not player:
+                assert not shown & {card.id for card in other.private_cards}
+            assert not shown & {card.id for card in other.hidden_cards}
+
+
+def test_diff_view_keeps_only_changes() -> None:
+    previous = {"table": [1, 2], "table_size": 2, "private": [5]}
+    current = {"table": [1, 2, 3], "table_size": 3, "private": [5], "dead_size": 0}
+    assert diff_view(previous, current) == {
+        "table": [1, 2, 3], "table_size": 3, "dead_size": 0}
+    assert diff_view(current, current) == {}
+
+
+def test_unknown_player_is_refused() -> None:
+    async def join_unknown():
+        game_server = GameServer(GameMode.FULL_MONTY, NAMES)
+        server = await game_server.start(port=0)
+        async with server:
+            client = GameClient("Nobody")
+            try:
+                await client.connect(port=server.sockets[0].getsockname()[1])
+            except ConnectionError as error:
+                return str(error)
+
+    assert asyncio.run(join_unknown()) == "Unknown player"
+
+
+def test_malformed_replies_are_refused() -> None:
+    garbage = [b"not json\n", b'{"type":"play","move":5}\n', b"[1, 2]\n", b'{"type":"pl']
+
+    async def play_with_raw_client():
+        game_server = GameServer(GameMode.FULL_MONTY, NAMES)
+        server = await game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        errors = []
+
+        async def raw_client():
+            reader, writer = await asyncio.open_connection(port=port)
+            writer.write(encode_message({"type": "join", "name": NAMES[0]}))
+            replies = list(garbage)
+            while line := await reader.readline():
+                message = decode_message(line)
+                if message["type"] == "error":
+                    errors.append(message["reason"])
+                elif message["type"] == "prompt":
+                    # Garbage first, the last line being truncated JSON
+                    if replies:
+                        writer.write(b"".join(replies) + b"\n")
+                        replies.clear()
+                    move = message["moves"][0]
+                    writer.write(encode_message({"type": "play", "move": move}))
+                elif message["type"] == "end":
+                    break
+            writer.close()
+
+        async with server:
+            clients = [GameClient(name) for name in NAMES[1:]]
+            joined = asyncio.create_task(raw_client())
+            for client in clients:
+                await client.connect(port=port)
+            winner, *_ = await asyncio.gather(
+                game_server.play(), joined,
+                *(client.run(lambda view, moves: moves[0]) for client in clients))
+        return winner, errors
+
+    random.seed(31)
+    winner, errors = asyncio.run(play_with_raw_client())
+    assert winner in NAMES
+    assert errors == ["Malformed message"]*4
@@ -0,0 +1,16 @@
+from cartamayor.engine import random_policy
+from cartamayor.tournament import match_seed, run_tournament
+
+
+def test_match_seeds_are_independent() -> None:
+    assert match_seed(1, 0) == match_seed(1, 0)
+    assert match_seed(1, 0) != match_seed(1, 1)
+    assert match_seed(1, 0) != match_seed(2, 0)
+
+
+def test_tournament_is_deterministic() -> None:
+    single = run_tournament(12, seed=3, workers=1, policy=random_policy)
+    pooled = run_tournament(12, seed=3, workers=2, policy=random_policy)
+    assert single == pooled
+    assert single.matches == sum(single.player_wins.values()) + single.interrupted
+    assert single != run_tournament(12, seed=4, workers=1, policy=random_policy)